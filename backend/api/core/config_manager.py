@@ -56,12 +56,21 @@ class ConfigManager:
         self.max_history_size = 100
         self.subscribers: Dict[str, List[Callable[[ConfigChange], None]]] = {}
         self.logger = logger
+        # model_dump()結果のキャッシュ（設定の保存・読み込み時に破棄）
+        self._config_dict_cache: Optional[Dict[str, Any]] = None
+        self._section_dict_cache: Dict[str, Dict[str, Any]] = {}
         
         # 設定ファイルの読み込み
         self._load_config()
     
+    def _invalidate_dict_cache(self) -> None:
+        """辞書キャッシュを破棄"""
+        self._config_dict_cache = None
+        self._section_dict_cache.clear()
+    
     def _load_config(self) -> None:
         """設定ファイルを読み込む"""
+        self._invalidate_dict_cache()
         try:
             if not self.config_path.exists():
                 self.logger.info(f"Config file not found at {self.config_path}, creating with defaults")
@@ -164,6 +173,8 @@ class ConfigManager:
         Returns:
             bool: 保存が成功したかどうか
         """
+        # 設定の変更はすべて保存を経由するので、ここでキャッシュを破棄
+        self._invalidate_dict_cache()
         try:
             if config is None:
                 config = self.config
@@ -192,6 +203,17 @@ class ConfigManager:
         """
         return self.config
     
+    def get_config_dict(self) -> Dict[str, Any]:
+        """
+        現在の設定を辞書で取得（次の変更までキャッシュされるため、呼び出し側で変更しないこと）
+        
+        Returns:
+            設定全体の辞書
+        """
+        if self._config_dict_cache is None:
+            self._config_dict_cache = self.config.model_dump()
+        return self._config_dict_cache
+    
     def reload_config(self) -> ChatbotConfig:
         """
         設定を再読み込み
@@ -252,23 +274,7 @@ class ConfigManager:
             if hasattr(self.config, section):
                 section_obj = getattr(self.config, section)
                 if hasattr(section_obj, field):
-                    field_type = type(getattr(section_obj, field))
-                    
-                    if field_type == bool and isinstance(value, str):
-                        value = value.lower() in ('true', '1', 'yes', 'on')
-                    elif field_type == int:
-                        # String stripping for integer configuration values
-                        if isinstance(value, str):
-                            value = value.strip()
-                        value = int(value)
-                    elif field_type == float:
-                        value = float(value)
-                    elif field_type == list and isinstance(value, str):
-                        import json
-                        value = json.loads(value)
-                    elif field_type == str:
-                        # String stripping for string configuration values (including URLs)
-                        value = value.strip()
+                    value = self._coerce_value(type(getattr(section_obj, field)), value)
                     
                     setattr(section_obj, field, value)
                     
@@ -310,6 +316,114 @@ class ConfigManager:
                 message=f"Error updating {section}.{field}: {str(e)}"
             )
     
+    def set_values(self, section: str, values: Dict[str, Any], user: str = "api", description: str = "") -> ConfigUpdateResult:
+        """
+        同一セクションの複数の設定値をまとめて更新（保存と通知は1回のみ）
+        
+        Args:
+            section: 設定セクション名
+            values: フィールド名と設定値の辞書
+            user: 更新ユーザー
+            description: 変更の説明
+            
+        Returns:
+            設定更新結果
+        """
+        try:
+            section_obj = getattr(self.config, section, None)
+            if section_obj is None:
+                return ConfigUpdateResult(
+                    success=False,
+                    message=f"Invalid config section: {section}"
+                )
+            
+            unknown = [field for field in values if not hasattr(section_obj, field)]
+            if unknown:
+                return ConfigUpdateResult(
+                    success=False,
+                    message=f"Invalid config path: {section}.{', '.join(unknown)}"
+                )
+            
+            # 全フィールドの型変換を先に行い、途中で失敗しても部分的に更新されないようにする
+            coerced = {
+                field: self._coerce_value(type(getattr(section_obj, field)), value)
+                for field, value in values.items()
+            }
+            
+            import time
+            timestamp = time.time()
+            changes = []
+            for field, value in coerced.items():
+                old_value = getattr(section_obj, field)
+                if old_value == value:
+                    continue
+                setattr(section_obj, field, value)
+                changes.append(ConfigChange(
+                    timestamp=timestamp,
+                    section=section,
+                    field=field,
+                    old_value=old_value,
+                    new_value=value,
+                    user=user,
+                    description=description
+                ))
+            
+            if not changes:
+                return ConfigUpdateResult(
+                    success=True,
+                    message=f"No change needed for {section}"
+                )
+            
+            for change in changes:
+                self._add_to_history(change)
+            
+            # 設定を保存
+            self.save_config()
+            
+            # 変更を通知
+            self._notify_subscribers(changes)
+            
+            return ConfigUpdateResult(
+                success=True,
+                message=f"Successfully updated {len(changes)} field(s) in {section}",
+                changes=changes
+            )
+        except Exception as e:
+            self.logger.error(f"Error updating config section {section}: {e}")
+            return ConfigUpdateResult(
+                success=False,
+                message=f"Error updating {section}: {str(e)}"
+            )
+    
+    @staticmethod
+    def _coerce_value(field_type: type, value: Any) -> Any:
+        """
+        既存フィールドの型に合わせて設定値を変換
+        
+        Args:
+            field_type: 既存の設定値の型
+            value: 設定値
+            
+        Returns:
+            変換後の設定値
+        """
+        if field_type == bool and isinstance(value, str):
+            value = value.lower() in ('true', '1', 'yes', 'on')
+        elif field_type == int:
+            # String stripping for integer configuration values
+            if isinstance(value, str):
+                value = value.strip()
+            value = int(value)
+        elif field_type == float:
+            value = float(value)
+        elif field_type == list and isinstance(value, str):
+            import json
+            value = json.loads(value)
+        elif field_type == str:
+            # String stripping for string configuration values (including URLs)
+            value = value.strip()
+        return value
+    
     def get_section(self, section_name: str) -> Optional[Any]:
         """
         特定の設定セクションを取得
@@ -328,6 +442,28 @@ class ConfigManager:
             self.logger.error(f"Error getting section {section_name}: {e}")
             return None
     
+    def get_section_dict(self, section_name: str) -> Optional[Dict[str, Any]]:
+        """
+        特定の設定セクションを辞書で取得（次の変更までキャッシュされるため、呼び出し側で変更しないこと）
+        
+        Args:
+            section_name: セクション名
+            
+        Returns:
+            セクションの辞書。存在しない場合はNone
+        """
+        cached = self._section_dict_cache.get(section_name)
+        if cached is not None:
+            return cached
+        
+        section = self.get_section(section_name)
+        if section is None:
+            return None
+        
+        section_dict = section.model_dump()
+        self._section_dict_cache[section_name] = section_dict
+        return section_dict
+    
     def validate_config(self) -> Dict[str, Any]:
         """
         設定を検証
@@ -685,6 +821,18 @@ class Settings:
     def QDRANT_COLLECTION_NAME(self) -> str:
         return self._config.qdrant.collection_name
     
+    @property
+    def QDRANT_SEARCH_CACHE_SIZE(self) -> int:
+        return self._config.qdrant.search_cache_size
+    
+    @property
+    def QDRANT_SEARCH_CACHE_THRESHOLD(self) -> float:
+        return self._config.qdrant.search_cache_threshold
+    
+    @property
+    def QDRANT_SEARCH_CACHE_CLUSTER_THRESHOLD(self) -> float:
+        return self._config.qdrant.search_cache_cluster_threshold
+    
     @property
     def EMBEDDING_PROVIDER(self) -> str:
         return self._config.embedding.provider
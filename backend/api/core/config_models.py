@@ -72,6 +72,9 @@ class QdrantConfig(BaseModel):
     grpc_port: int = Field(default=6334, ge=1, le=65535, description="QdrantサーバーのgRPCポート")
     collection_name: str = Field(default="chatbot_knowledge", description="Qdrantコレクション名")
     api_key: Optional[str] = Field(default=None, description="Qdrant APIキー")
+    search_cache_size: int = Field(default=2048, ge=0, description="検索結果キャッシュのクラスタ最大数（0で無効）")
+    search_cache_threshold: float = Field(default=0.92, ge=0.0, le=1.0, description="キャッシュ済みクエリとみなすコサイン類似度の閾値")
+    search_cache_cluster_threshold: float = Field(default=0.86, ge=0.0, le=1.0, description="同じクラスタにまとめるクエリのコサイン類似度の閾値")
 
 
 
@@ -90,6 +93,12 @@ class EmbeddingConfig(BaseModel):
         if v not in valid_providers:
             raise ValueError(f"Provider must be one of {valid_providers}")
         return v
+    
+    @field_validator('base_url')
+    @classmethod
+    def normalize_base_url(cls, v):
+        # 末尾のスラッシュを除いた正規形で保持する
+        return v.strip().rstrip('/')
 
 
 class LoggingConfig(BaseModel):
@@ -17,10 +17,20 @@ from sqlalchemy import text
 # import asyncmy
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from api.models.database import Base
+from api.models.database import Base, BULK_INSERT_PAGE_SIZE
 from api.core.config_manager import settings
 from api.core.utils import handle_exceptions, default_logger
 
+# Connection pool sizing for the async engine; the pool is per worker process
+DB_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("MYSQL_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = 1800
+# Compiled-statement cache entries; the message write/read path reuses a small
+# set of statements, so they stay compiled across requests
+DB_QUERY_CACHE_SIZE = 2048
+# Fail fast instead of queueing behind a stuck row lock on the write path
+DB_INIT_COMMAND = "SET SESSION innodb_lock_wait_timeout=5"
+
 
 class DatabaseManager:
     """
@@ -68,19 +78,24 @@ class DatabaseManager:
             safe_url = f"mysql+aiomysql://{username}:***@{host}:{port}/{database}"
             self.logger.info(f"Database URL: {safe_url}")
             
-            # Create async engine
+            # Create async engine. Connections are recycled well before MySQL's
+            # wait_timeout, so the per-checkout pre-ping round trip is skipped
             self.engine = create_async_engine(
                 db_url,
                 echo=False,  # Set to True for SQL logging
                 future=True,
-                pool_size=20,
-                max_overflow=30,
-                pool_pre_ping=True,
-                pool_recycle=3600,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_pre_ping=False,
+                pool_recycle=DB_POOL_RECYCLE,
+                query_cache_size=DB_QUERY_CACHE_SIZE,
+                insertmanyvalues_page_size=BULK_INSERT_PAGE_SIZE,
                 connect_args={
                     "charset": "utf8mb4",
                     "autocommit": False,
-                    "auth_plugin": "caching_sha2_password"
+                    "auth_plugin": "caching_sha2_password",
+                    "program_name": "chatbot",
+                    "init_command": DB_INIT_COMMAND
                 }
             )
             
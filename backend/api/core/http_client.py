@@ -0,0 +1,88 @@
+"""
+Shared HTTP client for outbound API calls
+
+This module provides a single process-wide httpx.AsyncClient so calls to
+Ollama / OpenAI-compatible endpoints reuse pooled keep-alive connections
+instead of opening a new connection pool per request.
+"""
+
+import os
+import importlib.util
+from typing import Optional, Dict, Tuple
+
+import httpx
+
+from api.core.utils import default_logger
+
+# Pool sizing for the shared client; the pool is per worker process
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+# Default timeout; callers pass their own per-request timeout where it differs
+HTTP_DEFAULT_TIMEOUT = 10.0
+# Largest response body get_bytes() will read before giving up
+HTTP_MAX_RESPONSE_BYTES = int(os.getenv("HTTP_MAX_RESPONSE_BYTES", str(8 * 1024 * 1024)))
+# HTTP/2 is negotiated over TLS when the optional h2 package is installed
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+
+class ResponseTooLargeError(httpx.HTTPError):
+    """Raised when a response body exceeds the configured size limit"""
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_DEFAULT_TIMEOUT,
+            http2=HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+    return _http_client
+
+
+async def get_bytes(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    max_bytes: int = HTTP_MAX_RESPONSE_BYTES
+) -> Tuple[int, httpx.Headers, bytes]:
+    """
+    GET a URL with the shared client, reading at most max_bytes of the body
+    
+    Returns:
+        (status code, response headers, body)
+    
+    Raises:
+        ResponseTooLargeError: If the body exceeds max_bytes
+    """
+    client = get_http_client()
+    request_timeout = timeout if timeout is not None else HTTP_DEFAULT_TIMEOUT
+    async with client.stream("GET", url, headers=headers, timeout=request_timeout) as response:
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise ResponseTooLargeError(f"Response from {url} is {content_length} bytes (limit {max_bytes})")
+        
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > max_bytes:
+                raise ResponseTooLargeError(f"Response from {url} exceeded {max_bytes} bytes")
+        return response.status_code, response.headers, bytes(body)
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient (called on application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        try:
+            await _http_client.aclose()
+        except Exception as e:
+            default_logger.warning(f"Error closing shared HTTP client: {e}")
+        _http_client = None
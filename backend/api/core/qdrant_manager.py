@@ -5,24 +5,123 @@ This module provides integration with Qdrant vector database for knowledge base
 """
 
 import os
+import re
+import random
 import asyncio
+import logging
 import warnings
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncGenerator, Callable, Tuple
 
 # Suppress LangChain deprecation warnings
 warnings.filterwarnings("ignore", message=".*OllamaEmbeddings.*deprecated.*", category=DeprecationWarning)
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    Filter,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    QuantizationSearchParams,
+    SearchParams,
+)
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 # from langchain_ollama import OllamaEmbeddings
 from langchain_qdrant import QdrantVectorStore as LangchainQdrant
 from langchain.schema import Document
 
 from api.core.config_manager import settings
+from api.core.semantic_cache import SemanticCache
 from api.core.utils import default_logger
 
 logger = default_logger
 
+# int8 scalar quantization keeps the quantized vectors in RAM (~4x smaller than
+# FP32) while the original vectors and payloads live on disk.
+COLLECTION_QUANTIZATION_CONFIG = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(
+        type=ScalarType.INT8,
+        quantile=0.99,
+        always_ram=True
+    )
+)
+
+# Rescore the oversampled quantized candidates with the original vectors so
+# search accuracy is preserved.
+QUANTIZED_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(
+        rescore=True,
+        oversampling=2.0
+    )
+)
+
+# Backoff (seconds) between Qdrant connection attempts during initialization
+CONNECT_RETRY_BASE_DELAY = 0.25
+CONNECT_RETRY_MAX_DELAY = 8.0
+CONNECT_RETRY_JITTER = 0.1
+
+# Directory ingestion: files read/split and chunk batches embedded+upserted in parallel
+INGEST_CONCURRENCY = 8
+INGEST_BATCH_SIZE = 64
+
+# Pattern to match URLs with ports and potential trailing spaces
+_URL_PORT_RE = re.compile(r'^(https?://[^:]+):(\d+)\s*$')
+
+# Payload keys that hold the document content rather than metadata
+_CONTENT_PAYLOAD_KEYS = ("page_content", "text")
+
+
+def _payload_metadata(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract metadata from a record payload"""
+    if "metadata" in payload:
+        return payload["metadata"]
+    # Use other payload fields as metadata
+    return {k: v for k, v in payload.items() if k not in _CONTENT_PAYLOAD_KEYS}
+
+
+def _extract_langchain(record: Any) -> Dict[str, Any]:
+    """Convert a record whose payload was written by LangChain (page_content)"""
+    payload = record.payload or {}
+    return {
+        "id": str(record.id),
+        "content": payload.get("page_content", ""),
+        "metadata": _payload_metadata(payload)
+    }
+
+
+def _extract_text(record: Any) -> Dict[str, Any]:
+    """Convert a record whose payload stores its content under the text key"""
+    payload = record.payload or {}
+    return {
+        "id": str(record.id),
+        "content": payload.get("text", ""),
+        "metadata": _payload_metadata(payload)
+    }
+
+
+def _extract_generic(record: Any) -> Dict[str, Any]:
+    """Convert a record with an unknown payload shape"""
+    payload = getattr(record, 'payload', None)
+    if not payload:
+        return {"id": str(record.id), "content": "", "metadata": {}}
+    # Fallback: use string representation of payload
+    return {
+        "id": str(record.id),
+        "content": str(payload),
+        "metadata": _payload_metadata(payload)
+    }
+
+
+def _select_record_extractor(payload: Optional[Dict[str, Any]]) -> Callable[[Any], Dict[str, Any]]:
+    """Pick the record converter once, based on the payload shape of a sample record"""
+    if payload:
+        if "page_content" in payload:
+            return _extract_langchain
+        if "text" in payload:
+            return _extract_text
+    return _extract_generic
+
 
 class QdrantManager:
     """Qdrant vector database manager"""
@@ -34,6 +133,33 @@ class QdrantManager:
         self.vectorstore = None
         self.embeddings = None
         self.collection_name = settings.QDRANT_COLLECTION_NAME
+        # Serialized vectors config of the collection; only changes when the collection is recreated
+        self._vectors_config_cache: Optional[Dict[str, Any]] = None
+        # Results of recent searches, reused for semantically near-identical queries
+        self.search_cache = SemanticCache(
+            max_size=settings.QDRANT_SEARCH_CACHE_SIZE,
+            threshold=settings.QDRANT_SEARCH_CACHE_THRESHOLD,
+            cluster_threshold=settings.QDRANT_SEARCH_CACHE_CLUSTER_THRESHOLD
+        )
+    
+    @property
+    def generation(self) -> int:
+        """Counter bumped whenever the collection contents change (for caches built on search results)"""
+        return self.search_cache.generation
+    
+    def _create_collection(self, dimension: int) -> None:
+        """Create the collection with quantized vector storage"""
+        self._vectors_config_cache = None
+        self.search_cache.invalidate()
+        self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(
+                size=dimension,
+                distance=Distance.COSINE
+            ),
+            quantization_config=COLLECTION_QUANTIZATION_CONFIG,
+            on_disk_payload=True
+        )
     
     async def get_collection_dimension(self) -> Optional[int]:
         """Get the current collection's vector dimension"""
@@ -50,7 +176,7 @@ class QdrantManager:
                     return vectors_config.size
             return None
         except Exception as e:
-            logger.warning(f"Error getting collection dimension: {e}")
+            logger.warning("Error getting collection dimension: %s", e)
             return None
     
     async def get_actual_embedding_dimension(self) -> int:
@@ -62,7 +188,7 @@ class QdrantManager:
             embedding = self.embeddings.embed_query(test_text)
             return len(embedding)
         except Exception as e:
-            logger.warning(f"Could not determine actual embedding dimension: {e}")
+            logger.warning("Could not determine actual embedding dimension: %s", e)
             # Fallback to setting
             return settings.EMBEDDING_DIMENSION
     
@@ -74,46 +200,43 @@ class QdrantManager:
         try:
             # Get actual embedding dimension
             actual_dimension = await self.get_actual_embedding_dimension()
-            logger.warning(f"Recreating collection {self.collection_name}")
-            logger.warning(f"  Configured dimension: {settings.EMBEDDING_DIMENSION}")
-            logger.warning(f"  Actual embedding dimension: {actual_dimension}")
+            logger.warning("Recreating collection %s", self.collection_name)
+            logger.warning("  Configured dimension: %s", settings.EMBEDDING_DIMENSION)
+            logger.warning("  Actual embedding dimension: %s", actual_dimension)
             
             # Use actual dimension for collection creation
             collection_dimension = actual_dimension
             
             # Update settings if actual dimension differs
             if actual_dimension != settings.EMBEDDING_DIMENSION:
-                logger.warning(f"  Updating dimension setting to match actual: {actual_dimension}")
+                logger.warning("  Updating dimension setting to match actual: %s", actual_dimension)
                 # Note: In a real implementation, you might want to update the config file
                 # For now, we'll use the actual dimension for collection creation
             
             # Delete existing collection
             try:
                 self.client.delete_collection(self.collection_name)
-                logger.info(f"Deleted existing collection: {self.collection_name}")
+                logger.info("Deleted existing collection: %s", self.collection_name)
             except Exception as e:
-                logger.warning(f"Collection deletion failed (may not exist): {e}")
+                logger.warning("Collection deletion failed (may not exist): %s", e)
             
             # Create new collection with correct dimension
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=collection_dimension,
-                    distance=Distance.COSINE
-                )
-            )
-            logger.info(f"Created new collection with dimension {collection_dimension}")
+            self._create_collection(collection_dimension)
+            logger.info("Created new collection with dimension %s", collection_dimension)
             
             return True
             
         except Exception as e:
-            logger.error(f"Error recreating collection: {e}")
+            logger.error("Error recreating collection: %s", e)
             return False
     
     async def initialize(self) -> bool:
         """Initialize Qdrant connection and create collection if needed"""
         try:
             logger.info("Initializing Qdrant manager")
+            self._vectors_config_cache = None
+            # The embedding model may have changed, so cached query vectors are stale
+            self.search_cache.invalidate()
             
             # Initialize embeddings
             # Clean up URL by removing trailing spaces from port
@@ -121,21 +244,19 @@ class QdrantManager:
             
             # Manual URL cleanup to ensure port number is properly formatted
             # This handles the case where there might be spaces after the port
-            import re
-            
-            # Pattern to match URLs with ports and potential trailing spaces
-            url_pattern = r'^(https?://[^:]+):(\d+)\s*$'
-            match = re.match(url_pattern, base_url)
+            match = _URL_PORT_RE.match(base_url)
             
             if match:
                 scheme_host = match.group(1)
                 port = match.group(2).strip()
                 base_url = f"{scheme_host}:{port}"
-                logger.info(f"Cleaned URL: {base_url}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Cleaned URL: %s", base_url)
             else:
                 # If no port is found, ensure the base URL is clean
                 base_url = base_url.strip()
-                logger.info(f"Using base URL as-is: {base_url}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Using base URL as-is: %s", base_url)
             
             # Try different embedding approaches
             embeddings_initialized = False
@@ -150,9 +271,9 @@ class QdrantManager:
                 logger.info("Using langchain_ollama for embeddings")
                 embeddings_initialized = True
             except ImportError as e:
-                logger.warning(f"Failed to import from langchain-ollama: {e}")
+                logger.warning("Failed to import from langchain-ollama: %s", e)
             except Exception as e:
-                logger.error(f"Failed to initialize embeddings from langchain_ollama: {e}")
+                logger.error("Failed to initialize embeddings from langchain_ollama: %s", e)
         
             # Approach 2: Fallback to langchain_community if ollama fails
             if not embeddings_initialized:
@@ -165,7 +286,7 @@ class QdrantManager:
                     logger.info("Using langchain_community for embeddings (fallback)")
                     embeddings_initialized = True
                 except Exception as e:
-                    logger.error(f"Failed to initialize embeddings from langchain_community: {e}")
+                    logger.error("Failed to initialize embeddings from langchain_community: %s", e)
             
             # Approach 3: Fallback to a mock embedding class if all else fails
             if not embeddings_initialized:
@@ -203,23 +324,28 @@ class QdrantManager:
                     prefer_grpc=False  # Use HTTP instead of gRPC for better compatibility
                 )
                 
-                logger.info(f"Attempting to connect to Qdrant at {qdrant_host}:{settings.QDRANT_PORT}")
+                logger.info("Attempting to connect to Qdrant at %s:%s", qdrant_host, settings.QDRANT_PORT)
                 
-                # Test connection with retry logic
+                # Test connection with retry logic (exponential backoff with jitter)
                 max_retries = 3
                 for attempt in range(max_retries):
                     try:
-                        collections = self.client.get_collections()
-                        logger.info(f"Qdrant connection successful on attempt {attempt + 1}")
+                        # Run the blocking probe in a worker thread to keep the event loop free
+                        await asyncio.to_thread(self.client.get_collections)
+                        logger.info("Qdrant connection successful on attempt %d", attempt + 1)
                         break
                     except Exception as e:
                         if attempt == max_retries - 1:
                             raise e
-                        logger.warning(f"Connection attempt {attempt + 1} failed: {e}, retrying...")
-                        await asyncio.sleep(2)  # Wait 2 seconds before retry
+                        logger.warning("Connection attempt %d failed: %r, retrying...", attempt + 1, e)
+                        delay = min(
+                            CONNECT_RETRY_MAX_DELAY,
+                            CONNECT_RETRY_BASE_DELAY * 2 ** attempt
+                        ) + random.uniform(0, CONNECT_RETRY_JITTER)
+                        await asyncio.sleep(delay)
                         
             except Exception as e:
-                logger.warning(f"Qdrant connection failed after all retries: {e}")
+                logger.warning("Qdrant connection failed after all retries: %s", e)
                 logger.info("Continuing in fallback mode without vector store")
                 # Create empty collection info for fallback mode
                 self.vectorstore = None
@@ -233,25 +359,19 @@ class QdrantManager:
                 
                 if self.collection_name not in collection_names:
                     # Collection doesn't exist, create it
-                    logger.info(f"Creating collection: {self.collection_name}")
-                    self.client.create_collection(
-                        collection_name=self.collection_name,
-                        vectors_config=VectorParams(
-                            size=settings.EMBEDDING_DIMENSION,
-                            distance=Distance.COSINE
-                        )
-                    )
+                    logger.info("Creating collection: %s", self.collection_name)
+                    self._create_collection(settings.EMBEDDING_DIMENSION)
                 else:
                     # Collection exists, check dimension compatibility
                     current_dimension = await self.get_collection_dimension()
                     actual_embedding_dimension = await self.get_actual_embedding_dimension()
                     
                     if current_dimension is not None and current_dimension != actual_embedding_dimension:
-                        logger.warning(f"Dimension mismatch detected!")
-                        logger.warning(f"  Collection dimension: {current_dimension}")
-                        logger.warning(f"  Actual embedding dimension: {actual_embedding_dimension}")
-                        logger.warning(f"  Configured dimension: {settings.EMBEDDING_DIMENSION}")
-                        logger.warning(f"  Recreating collection with correct dimension...")
+                        logger.warning("Dimension mismatch detected!")
+                        logger.warning("  Collection dimension: %s", current_dimension)
+                        logger.warning("  Actual embedding dimension: %s", actual_embedding_dimension)
+                        logger.warning("  Configured dimension: %s", settings.EMBEDDING_DIMENSION)
+                        logger.warning("  Recreating collection with correct dimension...")
                         
                         # Recreate collection with correct dimension
                         if await self.recreate_collection_with_new_dimension():
@@ -263,10 +383,10 @@ class QdrantManager:
                             self._initialized = True
                             return True
                     elif actual_embedding_dimension != settings.EMBEDDING_DIMENSION:
-                        logger.warning(f"Configuration mismatch detected!")
-                        logger.warning(f"  Configured dimension: {settings.EMBEDDING_DIMENSION}")
-                        logger.warning(f"  Actual embedding dimension: {actual_embedding_dimension}")
-                        logger.warning(f"  Consider updating config.toml to match actual dimension")
+                        logger.warning("Configuration mismatch detected!")
+                        logger.warning("  Configured dimension: %s", settings.EMBEDDING_DIMENSION)
+                        logger.warning("  Actual embedding dimension: %s", actual_embedding_dimension)
+                        logger.warning("  Consider updating config.toml to match actual dimension")
                 
                 # Initialize LangChain vectorstore
                 try:
@@ -274,9 +394,9 @@ class QdrantManager:
                     actual_embedding_dimension = await self.get_actual_embedding_dimension()
                     current_collection_dimension = await self.get_collection_dimension()
                     
-                    logger.info(f"Initializing LangChain Qdrant vectorstore")
-                    logger.info(f"  Collection dimension: {current_collection_dimension}")
-                    logger.info(f"  Embedding dimension: {actual_embedding_dimension}")
+                    logger.info("Initializing LangChain Qdrant vectorstore")
+                    logger.info("  Collection dimension: %s", current_collection_dimension)
+                    logger.info("  Embedding dimension: %s", actual_embedding_dimension)
                     
                     # Initialize LangChain vectorstore (without force_recreate param)
                     self.vectorstore = LangchainQdrant(
@@ -286,7 +406,7 @@ class QdrantManager:
                     )
                     logger.info("LangChain Qdrant vectorstore initialized successfully")
                 except Exception as e:
-                    logger.warning(f"LangChain Qdrant initialization failed: {e}")
+                    logger.warning("LangChain Qdrant initialization failed: %s", e)
                     # Fallback: create vectorstore without LangChain wrapper
                     logger.info("Using direct Qdrant client operations instead of LangChain wrapper")
                     self.vectorstore = None
@@ -296,13 +416,13 @@ class QdrantManager:
                 return True
                 
             except Exception as e:
-                logger.error(f"Error creating collection: {e}")
+                logger.error("Error creating collection: %s", e)
                 self.vectorstore = None
                 self._initialized = True
                 return True
                 
         except Exception as e:
-            logger.error(f"Error initializing Qdrant manager: {e}")
+            logger.error("Error initializing Qdrant manager: %s", e)
             self.vectorstore = None
             self._initialized = True
             return True
@@ -318,11 +438,12 @@ class QdrantManager:
             
             # Add to vectorstore
             self.vectorstore.add_documents([doc])
-            logger.info(f"Document added successfully")
+            self.search_cache.invalidate()
+            logger.info("Document added successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Error adding document: {e}")
+            logger.error("Error adding document: %s", e)
             return False
     
     async def add_documents_from_directory(self, directory_path: str, glob_pattern: str = "**/*.txt", chunk_size: int = 1000, chunk_overlap: int = 200) -> bool:
@@ -336,55 +457,125 @@ class QdrantManager:
             
             directory = Path(directory_path)
             if not directory.exists():
-                logger.error(f"Directory not found: {directory_path}")
+                logger.error("Directory not found: %s", directory_path)
                 return False
             
             # Find files
             files = list(directory.glob(glob_pattern))
             if not files:
-                logger.warning(f"No files found in {directory_path} with pattern {glob_pattern}")
+                logger.warning("No files found in %s with pattern %s", directory_path, glob_pattern)
                 return False
             
-            documents = []
             text_splitter = RecursiveCharacterTextSplitter(
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap
             )
+            semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
             
-            for file_path in files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Split into chunks
-                    chunks = text_splitter.split_text(content)
-                    
-                    for chunk in chunks:
-                        doc = Document(
-                            page_content=chunk,
-                            metadata={
-                                "source": str(file_path),
-                                "filename": file_path.name
-                            }
-                        )
-                        documents.append(doc)
-                        
-                except Exception as e:
-                    logger.error(f"Error processing file {file_path}: {e}")
-                    continue
+            def load_file(file_path) -> List[Document]:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Split into chunks
+                return [
+                    Document(
+                        page_content=chunk,
+                        metadata={
+                            "source": str(file_path),
+                            "filename": file_path.name
+                        }
+                    )
+                    for chunk in text_splitter.split_text(content)
+                ]
+            
+            async def load_one(file_path) -> List[Document]:
+                async with semaphore:
+                    try:
+                        return await asyncio.to_thread(load_file, file_path)
+                    except Exception as e:
+                        logger.error("Error processing file %s: %s", file_path, e)
+                        return []
+            
+            # Largest files first so the slowest ones do not end up at the tail
+            files.sort(key=lambda path: path.stat().st_size, reverse=True)
+            loaded = await asyncio.gather(*(load_one(file_path) for file_path in files))
+            documents = [doc for file_documents in loaded for doc in file_documents]
             
             if documents:
-                self.vectorstore.add_documents(documents)
-                logger.info(f"Added {len(documents)} document chunks from {len(files)} files")
+                await self._upsert_documents(documents)
+                logger.info("Added %d document chunks from %d files", len(documents), len(files))
                 return True
             else:
                 logger.warning("No documents were processed")
                 return False
                 
         except Exception as e:
-            logger.error(f"Error adding documents from directory: {e}")
+            logger.error("Error adding documents from directory: %s", e)
             return False
     
+    async def add_documents_batch(self, documents: List[Document], ids: Optional[List[str]] = None) -> bool:
+        """Add already-split documents to the vector store, optionally with their point IDs"""
+        if not self._initialized or not self.vectorstore:
+            return False
+        
+        try:
+            await self._upsert_documents(documents, ids)
+            logger.info("Added %d document chunks", len(documents))
+            return True
+            
+        except Exception as e:
+            logger.error("Error adding document batch: %s", e)
+            return False
+    
+    async def _upsert_documents(self, documents: List[Document], ids: Optional[List[str]] = None) -> None:
+        """Embed and upsert documents in batches, several batches at a time"""
+        semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
+        
+        async def add_batch(start: int) -> None:
+            end = start + INGEST_BATCH_SIZE
+            batch_ids = ids[start:end] if ids is not None else None
+            async with semaphore:
+                await asyncio.to_thread(self.vectorstore.add_documents, documents[start:end], ids=batch_ids)
+        
+        try:
+            await asyncio.gather(*(
+                add_batch(start)
+                for start in range(0, len(documents), INGEST_BATCH_SIZE)
+            ))
+        finally:
+            # Some batches may have been written even if another one failed
+            self.search_cache.invalidate()
+    
+    def _similarity_search_with_score_by_vector(self, embedding: List[float], k: int) -> List[Tuple[Document, float]]:
+        """Dense search with a precomputed query embedding
+        
+        langchain_qdrant only offers scored search by query text, which would embed
+        the query a second time; this mirrors its dense query and Document mapping.
+        """
+        vectorstore = self.vectorstore
+        points = vectorstore.client.query_points(
+            collection_name=vectorstore.collection_name,
+            query=embedding,
+            using=vectorstore.vector_name,
+            search_params=QUANTIZED_SEARCH_PARAMS,
+            limit=k,
+            with_payload=True,
+            with_vectors=False
+        ).points
+        
+        results = []
+        for point in points:
+            payload = point.payload or {}
+            metadata = payload.get(vectorstore.metadata_payload_key) or {}
+            metadata["_id"] = point.id
+            metadata["_collection_name"] = vectorstore.collection_name
+            document = Document(
+                page_content=payload.get(vectorstore.content_payload_key, ""),
+                metadata=metadata
+            )
+            results.append((document, point.score))
+        return results
+    
     async def search_similar_documents(self, query: str, k: int = 5, filter_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search for similar documents"""
         if not self._initialized:
@@ -400,22 +591,39 @@ class QdrantManager:
             ]
         
         try:
+            # Embed the query once; the vector is used for both the cache lookup and the search
+            generation = self.search_cache.generation
+            embedding = await asyncio.to_thread(self.embeddings.embed_query, query)
+            query_vector = SemanticCache.normalize(embedding)
+            
+            # filter_metadata is not applied to the search, so it does not affect cached results
+            if query_vector is not None:
+                cached = self.search_cache.lookup(query_vector, k)
+                if cached is not None:
+                    logger.info("Found %d similar documents (cached)", len(cached))
+                    return cached
+            
             # Search using vectorstore
-            results = self.vectorstore.similarity_search_with_score(query, k=k)
+            # Qdrant already returns scores as Python floats
+            results = await asyncio.to_thread(self._similarity_search_with_score_by_vector, embedding, k)
             
-            search_results = []
-            for doc, score in results:
-                search_results.append({
+            search_results = [
+                {
                     "content": doc.page_content,
                     "metadata": doc.metadata,
-                    "score": float(score)
-                })
+                    "score": score
+                }
+                for doc, score in results
+            ]
+            
+            if query_vector is not None:
+                self.search_cache.store(query_vector, k, search_results, generation)
             
-            logger.info(f"Found {len(search_results)} similar documents")
+            logger.info("Found %d similar documents", len(search_results))
             return search_results
             
         except Exception as e:
-            logger.error(f"Error searching similar documents: {e}")
+            logger.error("Error searching similar documents: %s", e)
             return []
     
     async def get_collection_info(self) -> Dict[str, Any]:
@@ -433,14 +641,18 @@ class QdrantManager:
         
         try:
             collection_info = self.client.get_collection(self.collection_name)
+            if self._vectors_config_cache is None:
+                vectors_config = getattr(collection_info.config.params, 'vectors', None)
+                if vectors_config:
+                    self._vectors_config_cache = vectors_config.model_dump()
             return {
                 "name": self.collection_name,
                 "count": collection_info.points_count,
                 "status": "active",
-                "vectors_config": collection_info.config.params.vectors.dict() if hasattr(collection_info.config.params, 'vectors') and collection_info.config.params.vectors else None
+                "vectors_config": self._vectors_config_cache
             }
         except Exception as e:
-            logger.error(f"Error getting collection info: {e}")
+            logger.error("Error getting collection info: %s", e)
             return {
                 "name": self.collection_name,
                 "count": 0,
@@ -448,53 +660,42 @@ class QdrantManager:
                 "error": str(e)
             }
     
-    async def list_documents(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """List documents in the collection"""
+    async def iter_documents(self, limit: int = 100, scroll_size: int = 64) -> AsyncGenerator[Dict[str, Any], None]:
+        """Iterate over documents in the collection, scrolling page by page"""
         if not self._initialized or not self.client:
-            return []
+            return
         
-        try:
-            # Scroll through collection
-            records = self.client.scroll(
+        remaining = limit
+        offset = None
+        extract = None
+        while remaining > 0:
+            # Scroll one page at a time so the event loop is not blocked
+            records, offset = await asyncio.to_thread(
+                self.client.scroll,
                 collection_name=self.collection_name,
-                limit=limit,
+                limit=min(scroll_size, remaining),
+                offset=offset,
                 with_payload=True
             )
             
-            documents = []
-            for record in records[0]:
-                # LangChain Qdrant integration stores page_content directly in payload
-                content = ""
-                metadata = {}
-                
-                if hasattr(record, 'payload') and record.payload:
-                    # Check if page_content exists directly in payload
-                    if "page_content" in record.payload:
-                        content = record.payload["page_content"]
-                    # If not, the entire payload might be the content
-                    elif "text" in record.payload:
-                        content = record.payload["text"]
-                    else:
-                        # Fallback: use string representation of payload
-                        content = str(record.payload)
-                    
-                    # Extract metadata
-                    if "metadata" in record.payload:
-                        metadata = record.payload["metadata"]
-                    else:
-                        # Use other payload fields as metadata
-                        metadata = {k: v for k, v in record.payload.items() if k not in ["page_content", "text"]}
-                
-                documents.append({
-                    "id": str(record.id),
-                    "content": content,
-                    "metadata": metadata
-                })
+            # All records in a collection share one payload shape, so decide
+            # how to convert them from the first record only
+            if extract is None and records:
+                extract = _select_record_extractor(getattr(records[0], 'payload', None))
             
-            return documents
+            for document in map(extract, records):
+                yield document
             
+            remaining -= len(records)
+            if offset is None or not records:
+                break
+    
+    async def list_documents(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """List documents in the collection"""
+        try:
+            return [document async for document in self.iter_documents(limit=limit)]
         except Exception as e:
-            logger.error(f"Error listing documents: {e}")
+            logger.error("Error listing documents: %s", e)
             return []
     
     async def delete_document_by_id(self, doc_id: str) -> bool:
@@ -507,11 +708,31 @@ class QdrantManager:
                 collection_name=self.collection_name,
                 points_selector=[doc_id]
             )
-            logger.info(f"Document {doc_id} deleted successfully")
+            self.search_cache.invalidate()
+            logger.info("Document %s deleted successfully", doc_id)
+            return True
+            
+        except Exception as e:
+            logger.error("Error deleting document %s: %s", doc_id, e)
+            return False
+    
+    async def delete_documents_by_ids(self, doc_ids: List[str]) -> bool:
+        """Delete several documents by ID in one request"""
+        if not self._initialized or not self.client:
+            return False
+        
+        try:
+            await asyncio.to_thread(
+                self.client.delete,
+                collection_name=self.collection_name,
+                points_selector=doc_ids
+            )
+            self.search_cache.invalidate()
+            logger.info("Deleted %d documents", len(doc_ids))
             return True
             
         except Exception as e:
-            logger.error(f"Error deleting document {doc_id}: {e}")
+            logger.error("Error deleting %d documents: %s", len(doc_ids), e)
             return False
     
     async def clear_collection(self) -> bool:
@@ -521,18 +742,14 @@ class QdrantManager:
         
         try:
             self.client.delete_collection(self.collection_name)
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=settings.EMBEDDING_DIMENSION,  # Use configured dimension
-                    distance=Distance.COSINE
-                )
-            )
+            self._vectors_config_cache = None
+            # Use configured dimension
+            self._create_collection(settings.EMBEDDING_DIMENSION)
             logger.info("Collection cleared successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Error clearing collection: {e}")
+            logger.error("Error clearing collection: %s", e)
             return False
 
 # Global instance
@@ -0,0 +1,147 @@
+"""
+Semantic cache for knowledge base searches
+
+This module keeps recent query embeddings with their search results so that a
+query close enough (cosine similarity) to a cached one can be answered from
+memory instead of running another vector search against Qdrant.
+
+Similar queries are grouped into clusters so that a lookup only scans the
+cluster centroids, a much smaller matrix than the number of distinct queries
+seen. The centroid is only a prefilter: a cached entry is returned only when
+its own query embedding is within the threshold of the new query.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Most recent member queries (embedding + results) kept per cluster
+CLUSTER_RESULTS_MAXLEN = 4
+
+
+class SemanticCache:
+    """In-process cache of search results keyed by query embedding similarity"""
+
+    def __init__(self, max_size: int = 2048, threshold: float = 0.92, cluster_threshold: float = 0.86):
+        # max_size is the number of clusters (centroids) kept
+        self.max_size = max_size
+        self.threshold = threshold
+        self.cluster_threshold = cluster_threshold
+        # L2-normalized float32 centroid per cluster
+        self._centroids: Optional[np.ndarray] = None
+        # Number of queries merged into each centroid
+        self._counts: Optional[np.ndarray] = None
+        # Per cluster: (member query embedding, k, results), oldest first
+        self._cluster_results: List[Deque[Tuple[np.ndarray, int, List[Dict[str, Any]]]]] = []
+        self._last_used: List[int] = []
+        self._size = 0
+        self._tick = 0
+        # Bumped on every invalidation so results computed before a write are not stored
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """L2-normalize an embedding; returns None for a zero vector"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def _nearest(self, query_vector: np.ndarray) -> Tuple[int, float]:
+        """Index and similarity of the closest centroid (caller holds the lock)"""
+        sims = self._centroids[:self._size] @ query_vector
+        index = int(np.argmax(sims))
+        return index, float(sims[index])
+
+    def lookup(self, query_vector: np.ndarray, k: int) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results of the most similar member query, if within the threshold"""
+        with self._lock:
+            if self._size == 0 or self._centroids.shape[1] != query_vector.shape[0]:
+                return None
+
+            # Coarse prefilter: only the closest cluster is searched
+            index, similarity = self._nearest(query_vector)
+            if similarity < self.cluster_threshold:
+                return None
+
+            best_results = None
+            best_similarity = self.threshold
+            for member_vector, cached_k, results in self._cluster_results[index]:
+                if cached_k < k:
+                    continue
+                member_similarity = float(member_vector @ query_vector)
+                if member_similarity >= best_similarity:
+                    best_results = results
+                    best_similarity = member_similarity
+            if best_results is None:
+                return None
+
+            self._tick += 1
+            self._last_used[index] = self._tick
+            return list(best_results[:k])
+
+    def store(self, query_vector: np.ndarray, k: int, results: List[Dict[str, Any]], generation: int) -> None:
+        """Cache results computed for query_vector at the given generation"""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            # The collection changed while the search was running
+            if generation != self.generation:
+                return
+
+            dimension = query_vector.shape[0]
+            if self._centroids is None or self._centroids.shape[1] != dimension:
+                # First entry, or the embedding model changed
+                self._reset(dimension)
+
+            self._tick += 1
+            if self._size:
+                index, similarity = self._nearest(query_vector)
+                if similarity >= self.cluster_threshold:
+                    # Fold the query into the cluster as a running mean, then renormalize
+                    count = int(self._counts[index])
+                    centroid = (self._centroids[index] * count + query_vector) / (count + 1)
+                    norm = float(np.linalg.norm(centroid))
+                    if norm > 0.0:
+                        self._centroids[index] = centroid / norm
+                    self._counts[index] = count + 1
+                    self._cluster_results[index].append((query_vector, k, results))
+                    self._last_used[index] = self._tick
+                    return
+
+            if self._size < self.max_size:
+                index = self._size
+                self._size += 1
+                self._cluster_results.append(deque(maxlen=CLUSTER_RESULTS_MAXLEN))
+                self._last_used.append(self._tick)
+            else:
+                # Replace the least recently used cluster
+                index = int(np.argmin(self._last_used))
+                self._cluster_results[index] = deque(maxlen=CLUSTER_RESULTS_MAXLEN)
+                self._last_used[index] = self._tick
+            self._centroids[index] = query_vector
+            self._counts[index] = 1
+            self._cluster_results[index].append((query_vector, k, results))
+
+    def invalidate(self) -> None:
+        """Drop all entries; called whenever the collection contents change"""
+        with self._lock:
+            self.generation += 1
+            self._size = 0
+            self._cluster_results = []
+            self._last_used = []
+
+    def _reset(self, dimension: int) -> None:
+        self._centroids = np.empty((self.max_size, dimension), dtype=np.float32)
+        self._counts = np.zeros(self.max_size, dtype=np.int32)
+        self._size = 0
+        self._cluster_results = []
+        self._last_used = []
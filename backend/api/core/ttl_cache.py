@@ -0,0 +1,84 @@
+"""
+Small async TTL cache for upstream lookups
+
+This module provides a bounded, per-process cache whose concurrent misses for
+the same key share one fetch. It backs the model listings served by the LLM
+and embedding configuration routes.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache with a fixed entry lifetime and shared in-flight fetches
+
+    Expired entries are kept until they are replaced or evicted, so a fetch can
+    use the previous value (for example to revalidate it with an ETag).
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        # Fetches currently running, by key
+        self._inflight: Dict[K, "asyncio.Task"] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+
+    async def get_or_fetch(
+        self,
+        key: K,
+        fetch: Callable[[Optional[V]], Awaitable[Optional[V]]],
+        refresh: bool = False
+    ) -> Optional[V]:
+        """Return the cached value for key, or fetch and cache it
+
+        Args:
+            fetch: Called with the expired value (or None); returns the value to
+                cache, or None when nothing should be cached
+            refresh: Fetch even if a fresh value is cached
+        """
+        entry = self._entries.get(key)
+        if entry is not None and not refresh and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        # Concurrent misses for the same key share one fetch
+        task = self._inflight.get(key)
+        if task is None:
+            stale = entry[1] if entry is not None else None
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch, stale))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so a caller that disconnects does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self,
+        key: K,
+        fetch: Callable[[Optional[V]], Awaitable[Optional[V]]],
+        stale: Optional[V]
+    ) -> Optional[V]:
+        value = await fetch(stale)
+        if value is None:
+            self._entries.pop(key, None)
+            return None
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
@@ -0,0 +1,180 @@
+"""Compact chat history schema
+
+Merges chat_metadata into chat_sessions, stores session/message IDs as
+ASCII keys, stores the message role as ENUM and the stats date as DATE,
+clusters chat_messages by session with compressed pages, indexes session
+tags and drops indexes that duplicate primary keys or unique constraints.
+
+Revision ID: 002_compact_chat_schema
+Revises: 001_initial_schema
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '002_compact_chat_schema'
+down_revision = '001_initial_schema'
+branch_labels = None
+depends_on = None
+
+IDENTIFIER_TYPE = mysql.VARCHAR(length=64, charset='ascii', collation='ascii_bin')
+ROLE_TYPE = mysql.ENUM('user', 'assistant', 'system', 'tool')
+
+# Columns moved from chat_metadata to chat_sessions
+SESSION_SUMMARY_COLUMNS = (
+    'total_messages',
+    'total_tokens',
+    'last_user_message',
+    'last_assistant_message',
+    'model_used',
+    'language',
+    'tags',
+    'custom_fields',
+)
+
+# Name MySQL gives the unnamed chat_messages.session_id foreign key from 001
+MESSAGES_SESSION_FK = 'chat_messages_ibfk_1'
+
+
+def _non_ascii_key(column: str) -> str:
+    """SQL condition matching IDs that do not fit the ASCII VARCHAR(64) key type"""
+    return (
+        f"(CHAR_LENGTH({column}) > 64 OR "
+        f"CAST({column} AS BINARY) <> CAST(CONVERT({column} USING ascii) AS BINARY))"
+    )
+
+
+def _rewrite_key(table: str, column: str) -> None:
+    # SHA2-256 hex is exactly 64 ASCII characters and deterministic, so a session
+    # ID rewritten in chat_sessions and chat_messages still matches
+    op.execute(
+        f"UPDATE {table} SET {column} = SHA2({column}, 256) WHERE {_non_ascii_key(column)}"
+    )
+
+
+def upgrade() -> None:
+    # --- chat_metadata -> chat_sessions ---
+    op.add_column('chat_sessions', sa.Column('total_messages', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('chat_sessions', sa.Column('total_tokens', sa.Integer(), nullable=True))
+    op.add_column('chat_sessions', sa.Column('last_user_message', sa.String(length=255), nullable=True))
+    op.add_column('chat_sessions', sa.Column('last_assistant_message', sa.String(length=255), nullable=True))
+    op.add_column('chat_sessions', sa.Column('model_used', sa.String(length=100), nullable=True))
+    op.add_column('chat_sessions', sa.Column('language', sa.String(length=10), nullable=False, server_default='ja'))
+    op.add_column('chat_sessions', sa.Column('tags', sa.JSON(), nullable=True))
+    op.add_column('chat_sessions', sa.Column('custom_fields', sa.JSON(), nullable=True))
+
+    assignments = ", ".join(f"s.{column} = m.{column}" for column in SESSION_SUMMARY_COLUMNS)
+    op.execute(
+        f"UPDATE chat_sessions s JOIN chat_metadata m ON m.session_id = s.session_id SET {assignments}"
+    )
+    op.drop_table('chat_metadata')
+
+    # The defaults were only needed to fill existing rows; the application sets them
+    op.alter_column('chat_sessions', 'total_messages', existing_type=sa.Integer(), existing_nullable=False, server_default=None)
+    op.alter_column('chat_sessions', 'language', existing_type=sa.String(length=10), existing_nullable=False, server_default=None)
+
+    # --- ASCII session / message IDs ---
+    # The FK has to go while both sides of it change type
+    op.drop_constraint(MESSAGES_SESSION_FK, 'chat_messages', type_='foreignkey')
+
+    # IDs that are too long or not ASCII would not convert; replace them with their hash
+    _rewrite_key('chat_sessions', 'session_id')
+    _rewrite_key('chat_messages', 'session_id')
+    _rewrite_key('chat_messages', 'message_id')
+
+    op.alter_column('chat_sessions', 'session_id', type_=IDENTIFIER_TYPE, existing_nullable=False)
+    op.alter_column('chat_messages', 'session_id', type_=IDENTIFIER_TYPE, existing_nullable=False)
+    op.alter_column('chat_messages', 'message_id', type_=IDENTIFIER_TYPE, existing_nullable=False)
+
+    # --- role as ENUM ---
+    op.execute("UPDATE chat_messages SET `role` = LOWER(TRIM(`role`))")
+    op.alter_column('chat_messages', 'role', type_=ROLE_TYPE, existing_nullable=False)
+
+    # --- chat_sessions indexes ---
+    # id / session_id are already indexed by the primary key and the UNIQUE constraint
+    op.drop_index('ix_chat_sessions_id', table_name='chat_sessions')
+    op.drop_index('ix_chat_sessions_session_id', table_name='chat_sessions')
+    # Multi-valued index over the JSON tags array (MySQL 8.0.17+)
+    op.execute("CREATE INDEX ix_chat_sessions_tags ON chat_sessions ((CAST(tags AS CHAR(64) ARRAY)))")
+
+    # --- chat_messages: cluster by session, compressed pages ---
+    op.create_index('ix_chat_messages_session_timestamp', 'chat_messages', ['session_id', 'timestamp'])
+    op.drop_index('ix_chat_messages_session_id', table_name='chat_messages')
+    op.drop_index('ix_chat_messages_message_id', table_name='chat_messages')
+    op.drop_index('ix_chat_messages_role', table_name='chat_messages')
+    # ix_chat_messages_id stays as the key the AUTO_INCREMENT id needs once it is
+    # no longer the leading primary key column
+    op.execute("ALTER TABLE chat_messages DROP PRIMARY KEY, ADD PRIMARY KEY (session_id, id)")
+    op.execute("ALTER TABLE chat_messages ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8")
+
+    op.create_foreign_key(
+        MESSAGES_SESSION_FK, 'chat_messages', 'chat_sessions',
+        ['session_id'], ['session_id'], ondelete='CASCADE'
+    )
+
+    # --- chat_history_stats ---
+    op.drop_index('ix_chat_history_stats_date', table_name='chat_history_stats')
+    op.drop_index('ix_chat_history_stats_id', table_name='chat_history_stats')
+    op.alter_column('chat_history_stats', 'date', type_=sa.Date(), existing_type=sa.String(length=10), existing_nullable=False)
+
+
+def downgrade() -> None:
+    # Rewritten (hashed) IDs are not restored
+    op.alter_column('chat_history_stats', 'date', type_=sa.String(length=10), existing_type=sa.Date(), existing_nullable=False)
+    op.create_index('ix_chat_history_stats_id', 'chat_history_stats', ['id'], unique=False)
+    op.create_index('ix_chat_history_stats_date', 'chat_history_stats', ['date'], unique=True)
+
+    op.drop_constraint(MESSAGES_SESSION_FK, 'chat_messages', type_='foreignkey')
+
+    op.execute("ALTER TABLE chat_messages ROW_FORMAT=DYNAMIC KEY_BLOCK_SIZE=0")
+    op.execute("ALTER TABLE chat_messages DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+    op.create_index('ix_chat_messages_role', 'chat_messages', ['role'], unique=False)
+    op.create_index('ix_chat_messages_message_id', 'chat_messages', ['message_id'], unique=True)
+    op.create_index('ix_chat_messages_session_id', 'chat_messages', ['session_id'], unique=False)
+    op.drop_index('ix_chat_messages_session_timestamp', table_name='chat_messages')
+
+    op.drop_index('ix_chat_sessions_tags', table_name='chat_sessions')
+    op.create_index('ix_chat_sessions_session_id', 'chat_sessions', ['session_id'], unique=True)
+    op.create_index('ix_chat_sessions_id', 'chat_sessions', ['id'], unique=False)
+
+    op.alter_column('chat_messages', 'role', type_=sa.String(length=50), existing_nullable=False)
+    op.alter_column('chat_messages', 'message_id', type_=sa.String(length=255), existing_nullable=False)
+    op.alter_column('chat_messages', 'session_id', type_=sa.String(length=255), existing_nullable=False)
+    op.alter_column('chat_sessions', 'session_id', type_=sa.String(length=255), existing_nullable=False)
+
+    op.create_foreign_key(
+        MESSAGES_SESSION_FK, 'chat_messages', 'chat_sessions',
+        ['session_id'], ['session_id'], ondelete='CASCADE'
+    )
+
+    op.create_table(
+        'chat_metadata',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(length=255), nullable=False),
+        sa.Column('total_messages', sa.Integer(), nullable=False, default=0),
+        sa.Column('total_tokens', sa.Integer(), nullable=True),
+        sa.Column('last_user_message', sa.String(length=255), nullable=True),
+        sa.Column('last_assistant_message', sa.String(length=255), nullable=True),
+        sa.Column('model_used', sa.String(length=100), nullable=True),
+        sa.Column('language', sa.String(length=10), nullable=False, default='ja'),
+        sa.Column('tags', sa.JSON(), nullable=True),
+        sa.Column('custom_fields', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['chat_sessions.session_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id')
+    )
+    op.create_index('ix_chat_metadata_id', 'chat_metadata', ['id'], unique=False)
+    op.create_index('ix_chat_metadata_session_id', 'chat_metadata', ['session_id'], unique=True)
+
+    columns = ", ".join(SESSION_SUMMARY_COLUMNS)
+    op.execute(
+        f"INSERT INTO chat_metadata (session_id, {columns}, created_at, updated_at) "
+        f"SELECT session_id, {columns}, created_at, updated_at FROM chat_sessions"
+    )
+    for column in reversed(SESSION_SUMMARY_COLUMNS):
+        op.drop_column('chat_sessions', column)
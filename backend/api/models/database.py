@@ -5,14 +5,32 @@ This module defines SQLAlchemy models for storing chat sessions, messages,
 and metadata in MySQL database.
 """
 
+import os
+import operator
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, select
+from typing import Optional, Dict, Any, List, Tuple, AsyncGenerator
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Boolean, Enum, ForeignKey, JSON, Index, PrimaryKeyConstraint, select, insert, update, delete, text
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.dialects.mysql import TEXT, LONGTEXT
+from sqlalchemy.dialects.mysql import TEXT, LONGTEXT, VARCHAR, insert as mysql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# Rows fetched per round trip when streaming large result sets through a server-side cursor
+STREAM_YIELD_PER = 500
+
+# Rows per executemany() call for bulk message inserts. aiomysql folds each call
+# into multi-row INSERT statements, so this bounds the statement size (content
+# and source_documents can be large) well below MySQL's max_allowed_packet
+BULK_INSERT_PAGE_SIZE = int(os.getenv("BULK_INSERT_PAGE_SIZE", "500"))
+
+# Session and message IDs are short ASCII tokens (UUIDs or "session_<ms>"), so a
+# single-byte binary-collated column keeps every key on them at most 64 bytes
+# (vs 1020 for utf8mb4 VARCHAR(255)) and compares them bytewise
+IDENTIFIER_TYPE = VARCHAR(64, charset="ascii", collation="ascii_bin")
+
 Base = declarative_base()
 
 
@@ -22,8 +40,8 @@ class ChatSession(Base):
     """
     __tablename__ = "chat_sessions"
     
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    session_id = Column(String(255), unique=True, index=True, nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(IDENTIFIER_TYPE, unique=True, nullable=False)
     title = Column(String(500), nullable=True)
     user_id = Column(String(255), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -31,24 +49,76 @@ class ChatSession(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     session_metadata = Column("metadata", JSON, nullable=True)
     
-    # Relationship with messages
-    messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
+    # Per-session counters and summary, kept on the session row so a message
+    # write only has to update this one row
+    total_messages = Column(Integer, default=0, nullable=False)
+    total_tokens = Column(Integer, default=0, nullable=True)
+    last_user_message = Column(String(255), nullable=True)
+    last_assistant_message = Column(String(255), nullable=True)
+    model_used = Column(String(100), nullable=True)
+    language = Column(String(10), default="ja", nullable=False)
+    tags = Column(JSON, nullable=True)  # List of tags for categorization
+    custom_fields = Column(JSON, nullable=True)  # Custom user-defined fields
+    
+    # Multi-valued index over the tags array so tag filters (MEMBER OF) are
+    # index seeks instead of a scan that parses every row's JSON
+    __table_args__ = (
+        Index("ix_chat_sessions_tags", text("(CAST(tags AS CHAR(64) ARRAY))")),
+    )
+    
+    # Relationship with messages; deleting a session is left to the FK's
+    # ON DELETE CASCADE instead of loading and deleting each message in Python
+    messages = relationship("ChatMessage", back_populates="session", passive_deletes=True)
     
     def __repr__(self):
         return f"<ChatSession(session_id='{self.session_id}', created_at='{self.created_at}')>"
     
+    # Output keys and the attributes they are read from, fetched in one C-level call
+    _DICT_KEYS = (
+        "id",
+        "session_id",
+        "title",
+        "user_id",
+        "created_at",
+        "updated_at",
+        "is_active",
+        "metadata"
+    )
+    _DICT_VALUES = operator.attrgetter(*("session_metadata" if key == "metadata" else key for key in _DICT_KEYS))
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "session_id": self.session_id,
-            "title": self.title,
-            "user_id": self.user_id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "is_active": self.is_active,
-            "metadata": self.session_metadata
-        }
+        data = dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
+        if data["created_at"]:
+            data["created_at"] = data["created_at"].isoformat()
+        if data["updated_at"]:
+            data["updated_at"] = data["updated_at"].isoformat()
+        return data
+    
+    _METADATA_DICT_KEYS = (
+        "id",
+        "session_id",
+        "total_messages",
+        "total_tokens",
+        "last_user_message",
+        "last_assistant_message",
+        "model_used",
+        "language",
+        "tags",
+        "custom_fields",
+        "created_at",
+        "updated_at"
+    )
+    _METADATA_DICT_VALUES = operator.attrgetter(*_METADATA_DICT_KEYS)
+    
+    def metadata_to_dict(self) -> Dict[str, Any]:
+        """Convert the session counters and summary to a dictionary"""
+        data = dict(zip(self._METADATA_DICT_KEYS, self._METADATA_DICT_VALUES(self)))
+        if data["created_at"]:
+            data["created_at"] = data["created_at"].isoformat()
+        if data["updated_at"]:
+            data["updated_at"] = data["updated_at"].isoformat()
+        return data
 
 
 class ChatMessage(Base):
@@ -57,10 +127,11 @@ class ChatMessage(Base):
     """
     __tablename__ = "chat_messages"
     
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    session_id = Column(String(255), ForeignKey("chat_sessions.session_id", ondelete="CASCADE"), nullable=False, index=True)
-    message_id = Column(String(255), unique=True, index=True, nullable=False)
-    role = Column(String(50), nullable=False, index=True)  # 'user', 'assistant', 'system'
+    id = Column(Integer, autoincrement=True, nullable=False)
+    session_id = Column(IDENTIFIER_TYPE, ForeignKey("chat_sessions.session_id", ondelete="CASCADE"), nullable=False)
+    message_id = Column(IDENTIFIER_TYPE, unique=True, nullable=False)
+    # 1-byte ENUM; not indexed since no query filters on role alone
+    role = Column(Enum("user", "assistant", "system", "tool", name="message_role"), nullable=False)
     content = Column(LONGTEXT, nullable=False)
     message_type = Column(String(50), default="text", nullable=False)  # 'text', 'file', 'error'
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -71,66 +142,41 @@ class ChatMessage(Base):
     # Relationship with session
     session = relationship("ChatSession", back_populates="messages")
     
+    # The clustered primary key leads with session_id so each session's messages
+    # are stored together; AUTO_INCREMENT needs its own index on id since it is
+    # not the leading column. The (session_id, timestamp) index serves "messages
+    # of a session ordered by time" without a filesort. Rows are page-compressed
+    # since content/source_documents dominate the table size
+    __table_args__ = (
+        PrimaryKeyConstraint("session_id", "id"),
+        Index("ix_chat_messages_id", "id"),
+        Index("ix_chat_messages_session_timestamp", "session_id", "timestamp"),
+        {"mysql_row_format": "COMPRESSED", "mysql_key_block_size": "8"},
+    )
+    
     def __repr__(self):
         return f"<ChatMessage(message_id='{self.message_id}', role='{self.role}', session_id='{self.session_id}')>"
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "session_id": self.session_id,
-            "message_id": self.message_id,
-            "role": self.role,
-            "content": self.content,
-            "message_type": self.message_type,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
-            "source_documents": self.source_documents,
-            "error_info": self.error_info,
-            "metadata": self.message_metadata
-        }
-
-
-class ChatMetadata(Base):
-    """
-    Chat metadata model for storing additional session metadata
-    """
-    __tablename__ = "chat_metadata"
-    
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    session_id = Column(String(255), ForeignKey("chat_sessions.session_id", ondelete="CASCADE"), nullable=False, unique=True)
-    total_messages = Column(Integer, default=0, nullable=False)
-    total_tokens = Column(Integer, default=0, nullable=True)
-    last_user_message = Column(String(255), nullable=True)
-    last_assistant_message = Column(String(255), nullable=True)
-    model_used = Column(String(100), nullable=True)
-    language = Column(String(10), default="ja", nullable=False)
-    tags = Column(JSON, nullable=True)  # List of tags for categorization
-    custom_fields = Column(JSON, nullable=True)  # Custom user-defined fields
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
-    # Relationship with session
-    session = relationship("ChatSession", foreign_keys=[session_id])
-    
-    def __repr__(self):
-        return f"<ChatMetadata(session_id='{self.session_id}', total_messages={self.total_messages})>"
+    _DICT_KEYS = (
+        "id",
+        "session_id",
+        "message_id",
+        "role",
+        "content",
+        "message_type",
+        "timestamp",
+        "source_documents",
+        "error_info",
+        "metadata"
+    )
+    _DICT_VALUES = operator.attrgetter(*("message_metadata" if key == "metadata" else key for key in _DICT_KEYS))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "session_id": self.session_id,
-            "total_messages": self.total_messages,
-            "total_tokens": self.total_tokens,
-            "last_user_message": self.last_user_message,
-            "last_assistant_message": self.last_assistant_message,
-            "model_used": self.model_used,
-            "language": self.language,
-            "tags": self.tags,
-            "custom_fields": self.custom_fields,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
+        data = dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
+        if data["timestamp"]:
+            data["timestamp"] = data["timestamp"].isoformat()
+        return data
 
 
 class ChatHistoryStats(Base):
@@ -139,8 +185,8 @@ class ChatHistoryStats(Base):
     """
     __tablename__ = "chat_history_stats"
     
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    date = Column(String(10), unique=True, nullable=False, index=True)  # YYYY-MM-DD format
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    date = Column(Date, unique=True, nullable=False)
     total_sessions = Column(Integer, default=0, nullable=False)
     total_messages = Column(Integer, default=0, nullable=False)
     total_users = Column(Integer, default=0, nullable=False)
@@ -151,47 +197,150 @@ class ChatHistoryStats(Base):
     def __repr__(self):
         return f"<ChatHistoryStats(date='{self.date}', total_sessions={self.total_sessions})>"
     
+    _DICT_KEYS = (
+        "id",
+        "date",
+        "total_sessions",
+        "total_messages",
+        "total_users",
+        "avg_session_length",
+        "created_at",
+        "updated_at"
+    )
+    _DICT_VALUES = operator.attrgetter(*_DICT_KEYS)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "date": self.date,
-            "total_sessions": self.total_sessions,
-            "total_messages": self.total_messages,
-            "total_users": self.total_users,
-            "avg_session_length": self.avg_session_length,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
+        data = dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
+        if data["date"]:
+            data["date"] = data["date"].isoformat()
+        if data["created_at"]:
+            data["created_at"] = data["created_at"].isoformat()
+        if data["updated_at"]:
+            data["updated_at"] = data["updated_at"].isoformat()
+        return data
 
 
 # Database utility functions
-def create_chat_session(
-    db: Session, 
-    session_id: str, 
-    title: Optional[str] = None, 
-    user_id: Optional[str] = None,
-    metadata: Optional[Dict[str, Any]] = None
-) -> ChatSession:
-    """Create a new chat session"""
+def uuid7_str() -> str:
+    """Generate a time-ordered UUIDv7 string (RFC 9562)
+    
+    The leading 48 bits are the Unix time in milliseconds, so new IDs append to
+    the end of the message_id index instead of landing on random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+def chat_session_has_tag(tag: str):
+    """Build a WHERE clause matching sessions whose tags contain tag (uses ix_chat_sessions_tags)"""
+    return text("CAST(:tag AS CHAR(64)) MEMBER OF (chat_sessions.tags)").bindparams(tag=tag)
+
+
+def _build_chat_session_inserts(
+    session_id: str,
+    title: Optional[str],
+    user_id: Optional[str],
+    metadata: Optional[Dict[str, Any]]
+):
+    """Build the session INSERT statement and the matching detached ChatSession
+    
+    MySQL has no INSERT ... RETURNING, so the timestamps are generated here and
+    the primary key is taken from the INSERT result (lastrowid).
+    """
+    now = datetime.utcnow()
     session = ChatSession(
         session_id=session_id,
         title=title,
         user_id=user_id,
-        metadata=metadata or {}
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+        session_metadata=metadata or {},
+        total_messages=0,
+        language="ja"
     )
-    db.add(session)
-    db.commit()
-    db.refresh(session)
-    
-    # Create metadata record
-    chat_metadata = ChatMetadata(
+    session_stmt = insert(ChatSession.__table__).values(
         session_id=session_id,
+        title=title,
+        user_id=user_id,
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+        metadata=session.session_metadata,
         total_messages=0,
         language="ja"
     )
-    db.add(chat_metadata)
+    return session_stmt, session
+
+
+def _update_session_counters(
+    session_id: str,
+    message_count: int,
+    last_user_message: Optional[str],
+    last_assistant_message: Optional[str],
+    now: datetime
+):
+    """Build the single UPDATE that bumps a session's counters and updated_at
+    
+    Preview columns that are not part of this write keep their stored value.
+    """
+    values = {
+        "total_messages": ChatSession.total_messages + message_count,
+        "updated_at": now
+    }
+    if last_user_message is not None:
+        values["last_user_message"] = last_user_message
+    if last_assistant_message is not None:
+        values["last_assistant_message"] = last_assistant_message
+    return (
+        update(ChatSession)
+        .where(ChatSession.session_id == session_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _daily_stats_upsert(now: datetime, sessions: int = 0, messages: int = 0):
+    """Build the INSERT ... ON DUPLICATE KEY UPDATE that adds to today's stats row
+    
+    Keeping the per-day counters current on write makes them O(1) per event
+    instead of an aggregate over chat_messages.
+    """
+    stmt = mysql_insert(ChatHistoryStats).values(
+        date=now.date(),
+        total_sessions=sessions,
+        total_messages=messages,
+        total_users=0,
+        avg_session_length=0,
+        created_at=now,
+        updated_at=now
+    )
+    return stmt.on_duplicate_key_update(
+        total_sessions=ChatHistoryStats.total_sessions + sessions,
+        total_messages=ChatHistoryStats.total_messages + messages,
+        updated_at=now
+    )
+
+
+def create_chat_session(
+    db: Session, 
+    session_id: str, 
+    title: Optional[str] = None, 
+    user_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> ChatSession:
+    """Create a new chat session"""
+    session_stmt, session = _build_chat_session_inserts(session_id, title, user_id, metadata)
+    
+    # The generated id comes back with the INSERT, so no refresh is needed
+    result = db.execute(session_stmt)
+    session.id = result.inserted_primary_key[0]
+    db.execute(_daily_stats_upsert(session.created_at, sessions=1))
     db.commit()
+    invalidate_chat_session_cache(session_id)
     
     return session
 
@@ -208,47 +357,43 @@ def add_chat_message(
     metadata: Optional[Dict[str, Any]] = None
 ) -> ChatMessage:
     """Add a new chat message"""
-    import uuid
-    
     if not message_id:
-        message_id = str(uuid.uuid4())
+        message_id = uuid7_str()
     
+    now = datetime.utcnow()
     message = ChatMessage(
         session_id=session_id,
         message_id=message_id,
         role=role,
         content=content,
         message_type=message_type,
+        timestamp=now,
         source_documents=source_documents,
         error_info=error_info,
-        metadata=metadata or {}
+        message_metadata=metadata or {}
     )
     db.add(message)
     
-    # Update session metadata
-    chat_meta = db.query(ChatMetadata).filter(ChatMetadata.session_id == session_id).first()
-    if chat_meta:
-        chat_meta.total_messages += 1
-        chat_meta.updated_at = datetime.utcnow()
-        
-        if role == "user":
-            chat_meta.last_user_message = content[:255]
-        elif role == "assistant":
-            chat_meta.last_assistant_message = content[:255]
-        
-        # Update session updated_at
-        session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
-        if session:
-            session.updated_at = datetime.utcnow()
+    # Update session counters and timestamp without reading them first
+    db.execute(_update_session_counters(
+        session_id,
+        1,
+        content[:255] if role == "user" else None,
+        content[:255] if role == "assistant" else None,
+        now
+    ))
+    db.execute(_daily_stats_upsert(now, messages=1))
     
     db.commit()
+    invalidate_chat_session_cache(session_id)
     db.refresh(message)
     return message
 
 
 def get_chat_session(db: Session, session_id: str) -> Optional[ChatSession]:
     """Get chat session by session_id"""
-    return db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
+    result = db.execute(select(ChatSession).where(ChatSession.session_id == session_id))
+    return result.scalar_one_or_none()
 
 
 def get_chat_messages(
@@ -258,39 +403,49 @@ def get_chat_messages(
     offset: Optional[int] = None
 ) -> list[ChatMessage]:
     """Get chat messages for a session"""
-    query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id).order_by(ChatMessage.timestamp.asc())
+    query = select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.timestamp.asc())
     
     if limit:
         query = query.limit(limit)
     if offset:
         query = query.offset(offset)
     
-    return query.all()
-
-
-def get_chat_metadata(db: Session, session_id: str) -> Optional[ChatMetadata]:
-    """Get chat metadata by session_id"""
-    return db.query(ChatMetadata).filter(ChatMetadata.session_id == session_id).first()
+    return db.execute(query).scalars().all()
 
 
 def delete_chat_session(db: Session, session_id: str) -> bool:
     """Delete a chat session and all related data"""
-    session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
-    if session:
-        db.delete(session)
-        db.commit()
-        return True
-    return False
+    result = db.execute(delete(ChatSession).where(ChatSession.session_id == session_id))
+    db.commit()
+    invalidate_chat_session_cache(session_id)
+    return result.rowcount > 0
 
 
 def get_active_sessions(db: Session, limit: Optional[int] = None) -> list[ChatSession]:
     """Get active chat sessions"""
-    query = db.query(ChatSession).filter(ChatSession.is_active == True).order_by(ChatSession.updated_at.desc())
+    query = select(ChatSession).where(ChatSession.is_active == True).order_by(ChatSession.updated_at.desc())
     
     if limit:
         query = query.limit(limit)
     
-    return query.all()
+    return db.execute(query).scalars().all()
+
+
+# Per-process cache of recent session lookups: session_id -> (expires_at, session).
+# Entries are dropped on every write to the session from this process; other
+# processes may see a change up to SESSION_CACHE_TTL seconds late. The least
+# recently used entry is evicted once SESSION_CACHE_MAX_ENTRIES is reached.
+SESSION_CACHE_TTL = 5.0
+SESSION_CACHE_MAX_ENTRIES = 1024
+_SESSION_CACHE: "OrderedDict[str, Tuple[float, ChatSession]]" = OrderedDict()
+
+
+def invalidate_chat_session_cache(session_id: Optional[str] = None) -> None:
+    """Drop one cached session lookup, or all of them when session_id is None"""
+    if session_id is None:
+        _SESSION_CACHE.clear()
+    else:
+        _SESSION_CACHE.pop(session_id, None)
 
 
 # Async versions of database functions
@@ -300,6 +455,29 @@ async def get_chat_session_async(db: AsyncSession, session_id: str) -> Optional[
     return result.scalar_one_or_none()
 
 
+async def get_chat_session_cached_async(db: AsyncSession, session_id: str) -> Optional[ChatSession]:
+    """Get chat session by session_id through the short-lived cache (read-only use)
+    
+    The returned instance may come from an earlier database session, so it must
+    not be modified; use get_chat_session_async for updates.
+    """
+    now = time.monotonic()
+    cached = _SESSION_CACHE.get(session_id)
+    if cached is not None:
+        if cached[0] > now:
+            _SESSION_CACHE.move_to_end(session_id)
+            return cached[1]
+        del _SESSION_CACHE[session_id]
+    
+    session = await get_chat_session_async(db, session_id)
+    if session is not None:
+        _SESSION_CACHE[session_id] = (now + SESSION_CACHE_TTL, session)
+        _SESSION_CACHE.move_to_end(session_id)
+        while len(_SESSION_CACHE) > SESSION_CACHE_MAX_ENTRIES:
+            _SESSION_CACHE.popitem(last=False)
+    return session
+
+
 async def get_chat_messages_async(
     db: AsyncSession, 
     session_id: str, 
@@ -318,21 +496,101 @@ async def get_chat_messages_async(
     return result.scalars().all()
 
 
-async def get_chat_metadata_async(db: AsyncSession, session_id: str) -> Optional[ChatMetadata]:
-    """Get chat metadata by session_id (async version)"""
-    result = await db.execute(select(ChatMetadata).where(ChatMetadata.session_id == session_id))
-    return result.scalar_one_or_none()
+# Message columns for read-only queries, labelled with the keys of ChatMessage.to_dict
+_MESSAGE_COLUMNS = (
+    ChatMessage.id,
+    ChatMessage.session_id,
+    ChatMessage.message_id,
+    ChatMessage.role,
+    ChatMessage.content,
+    ChatMessage.message_type,
+    ChatMessage.timestamp,
+    ChatMessage.source_documents,
+    ChatMessage.error_info,
+    ChatMessage.message_metadata.label("metadata")
+)
+_MESSAGE_KEYS = ChatMessage._DICT_KEYS
+
+
+def _message_values_to_dict(values) -> Dict[str, Any]:
+    """Build a message dict (same shape as ChatMessage.to_dict) from _MESSAGE_COLUMNS values"""
+    message = dict(zip(_MESSAGE_KEYS, values))
+    if message["timestamp"]:
+        message["timestamp"] = message["timestamp"].isoformat()
+    return message
+
+
+async def get_chat_messages_raw_async(
+    db: AsyncSession,
+    session_id: str,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Get chat messages for a session as plain dicts, bypassing the ORM (read-only)"""
+    query = select(*_MESSAGE_COLUMNS).where(ChatMessage.session_id == session_id).order_by(ChatMessage.timestamp.asc())
+    
+    if limit:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+    
+    result = await db.execute(query)
+    return [_message_values_to_dict(row) for row in result]
+
+
+async def get_chat_session_with_messages_async(
+    db: AsyncSession,
+    session_id: str
+) -> Optional[Tuple[ChatSession, List[Dict[str, Any]]]]:
+    """Get a session and all of its messages (as plain dicts) in one round trip (async version)
+    
+    The session row is LEFT JOINed to its messages, so a session without
+    messages still yields one row whose message columns are NULL.
+    """
+    query = (
+        select(ChatSession, *_MESSAGE_COLUMNS)
+        .outerjoin(ChatMessage, ChatMessage.session_id == ChatSession.session_id)
+        .where(ChatSession.session_id == session_id)
+        .order_by(ChatMessage.timestamp.asc())
+    )
+    
+    result = await db.execute(query)
+    session = None
+    messages = []
+    for row in result:
+        session = row[0]
+        if row[1] is not None:
+            messages.append(_message_values_to_dict(row[1:]))
+    
+    if session is None:
+        return None
+    return session, messages
+
+
+async def iter_chat_messages_async(
+    db: AsyncSession,
+    session_id: str
+) -> AsyncGenerator[ChatMessage, None]:
+    """Stream chat messages for a session in chunks via a server-side cursor (async version)"""
+    query = (
+        select(ChatMessage)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.timestamp.asc())
+        .execution_options(yield_per=STREAM_YIELD_PER)
+    )
+    
+    result = await db.stream_scalars(query)
+    async for message in result:
+        yield message
 
 
 async def delete_chat_session_async(db: AsyncSession, session_id: str) -> bool:
     """Delete a chat session and all related data (async version)"""
-    result = await db.execute(select(ChatSession).where(ChatSession.session_id == session_id))
-    session = result.scalar_one_or_none()
-    if session:
-        await db.delete(session)
-        await db.commit()
-        return True
-    return False
+    # Messages go with it through the FK's ON DELETE CASCADE in the same statement
+    result = await db.execute(delete(ChatSession).where(ChatSession.session_id == session_id))
+    await db.commit()
+    invalidate_chat_session_cache(session_id)
+    return result.rowcount > 0
 
 
 async def get_active_sessions_async(db: AsyncSession, limit: Optional[int] = None) -> list[ChatSession]:
@@ -354,24 +612,14 @@ async def create_chat_session_async(
     metadata: Optional[Dict[str, Any]] = None
 ) -> ChatSession:
     """Create a new chat session (async version)"""
-    session = ChatSession(
-        session_id=session_id,
-        title=title,
-        user_id=user_id,
-        session_metadata=metadata or {}
-    )
-    db.add(session)
-    await db.commit()
-    await db.refresh(session)
+    session_stmt, session = _build_chat_session_inserts(session_id, title, user_id, metadata)
     
-    # Create metadata record
-    chat_metadata = ChatMetadata(
-        session_id=session_id,
-        total_messages=0,
-        language="ja"
-    )
-    db.add(chat_metadata)
+    # The generated id comes back with the INSERT, so no refresh is needed
+    result = await db.execute(session_stmt)
+    session.id = result.inserted_primary_key[0]
+    await db.execute(_daily_stats_upsert(session.created_at, sessions=1))
     await db.commit()
+    invalidate_chat_session_cache(session_id)
     
     return session
 
@@ -388,45 +636,93 @@ async def add_chat_message_async(
     metadata: Optional[Dict[str, Any]] = None
 ) -> ChatMessage:
     """Add a new chat message (async version)"""
-    import uuid
-    
     if not message_id:
-        message_id = str(uuid.uuid4())
+        message_id = uuid7_str()
     
+    now = datetime.utcnow()
     message = ChatMessage(
         session_id=session_id,
         message_id=message_id,
         role=role,
         content=content,
         message_type=message_type,
+        timestamp=now,
         source_documents=source_documents,
         error_info=error_info,
         message_metadata=metadata or {}
     )
     db.add(message)
     
-    # Update session metadata
-    metadata_result = await db.execute(
-        select(ChatMetadata).where(ChatMetadata.session_id == session_id)
-    )
-    chat_meta = metadata_result.scalar_one_or_none()
-    if chat_meta:
-        chat_meta.total_messages += 1
-        chat_meta.updated_at = datetime.utcnow()
+    # Update session counters and timestamp without reading them first
+    await db.execute(_update_session_counters(
+        session_id,
+        1,
+        content[:255] if role == "user" else None,
+        content[:255] if role == "assistant" else None,
+        now
+    ))
+    await db.execute(_daily_stats_upsert(now, messages=1))
+    
+    await db.commit()
+    invalidate_chat_session_cache(session_id)
+    await db.refresh(message)
+    return message
+
+
+async def add_chat_messages_async(
+    db: AsyncSession,
+    rows: List[Dict[str, Any]]
+) -> List[str]:
+    """Add multiple chat messages with paged multi-row INSERTs (async version)
+    
+    Each row accepts the same fields as ``add_chat_message_async``
+    (``session_id``, ``role``, ``content`` and the optional ones). The
+    per-session counters are updated with one statement per session
+    and everything is committed once.
+    
+    Returns:
+        The message IDs of the inserted rows, in input order
+    """
+    if not rows:
+        return []
+    
+    now = datetime.utcnow()
+    values = []
+    # session_id -> [message count, last user message, last assistant message]
+    session_updates: Dict[str, list] = {}
+    for row in rows:
+        session_id = row["session_id"]
+        role = row["role"]
+        content = row["content"]
+        values.append({
+            "session_id": session_id,
+            "message_id": row.get("message_id") or uuid7_str(),
+            "role": role,
+            "content": content,
+            "message_type": row.get("message_type") or "text",
+            "timestamp": row.get("timestamp") or now,
+            "source_documents": row.get("source_documents"),
+            "error_info": row.get("error_info"),
+            "message_metadata": row.get("metadata") or {}
+        })
         
+        summary = session_updates.setdefault(session_id, [0, None, None])
+        summary[0] += 1
         if role == "user":
-            chat_meta.last_user_message = content[:255]
+            summary[1] = content[:255]
         elif role == "assistant":
-            chat_meta.last_assistant_message = content[:255]
+            summary[2] = content[:255]
     
-    # Update session timestamp
-    update_session = await db.execute(
-        select(ChatSession).where(ChatSession.session_id == session_id)
-    )
-    session = update_session.scalar_one_or_none()
-    if session:
-        session.updated_at = datetime.utcnow()
+    # Multi-row INSERTs, one executemany() per page of rows
+    for start in range(0, len(values), BULK_INSERT_PAGE_SIZE):
+        await db.execute(insert(ChatMessage), values[start:start + BULK_INSERT_PAGE_SIZE])
+    
+    # Update session counters and timestamp once per session
+    for session_id, (count, last_user, last_assistant) in session_updates.items():
+        await db.execute(_update_session_counters(session_id, count, last_user, last_assistant, now))
+    await db.execute(_daily_stats_upsert(now, messages=len(values)))
     
     await db.commit()
-    await db.refresh(message)
-    return message
\ No newline at end of file
+    for session_id in session_updates:
+        invalidate_chat_session_cache(session_id)
+    return [value["message_id"] for value in values]
@@ -5,12 +5,14 @@ This module provides API endpoints for chat functionality.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, field_validator
-import json
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy.exc import NoResultFound
+import orjson
 
 from api.core.qdrant_manager import qdrant_manager
 from api.core.database import database_manager
@@ -19,19 +21,106 @@ from api.services.chat_service import chat_service
 from api.services.chat_history_service import chat_history_service
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Server-sent event framing, pre-encoded so each event is built as bytes
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+
+# Session IDs are stored as ASCII VARCHAR(64) keys; caller-supplied IDs must fit.
+# An empty ID (the frontend's initial state) still means "generate one".
+SESSION_ID_MAX_LENGTH = 64
+SESSION_ID_PATTERN = r'^[\x21-\x7e]*$'
+
+# Limits for merging consecutive token chunks into a single SSE event
+STREAM_BATCH_MAX_CHUNKS = 16
+STREAM_BATCH_MAX_SECONDS = 0.025
+# Marks the end of the source stream in _coalesce_tokens' queue
+_STREAM_END = object()
+
+
+async def _coalesce_tokens(
+    chunks: AsyncIterator[Dict[str, Any]],
+    max_chunks: int = STREAM_BATCH_MAX_CHUNKS,
+    max_seconds: float = STREAM_BATCH_MAX_SECONDS
+) -> AsyncIterator[Dict[str, Any]]:
+    """Merge runs of "token" chunks into one chunk carrying the joined text
+    
+    A batch is flushed once it holds max_chunks tokens, max_seconds after its
+    first token even if no further chunk arrives, or when a non-token chunk
+    arrives. The merged chunk keeps the shape of a single token chunk (with
+    the index of its first token), so clients that append chunk["token"]
+    work unchanged.
+    
+    The source is read by a separate task into a small queue, so waiting for
+    the next chunk can time out without cancelling the source mid-step.
+    """
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_chunks)
+    error: Optional[Exception] = None
+    
+    async def pump() -> None:
+        nonlocal error
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as e:
+            error = e
+        await queue.put(_STREAM_END)
+    
+    batch: List[Dict[str, Any]] = []
+    deadline = 0.0
+    
+    def flush() -> Dict[str, Any]:
+        merged = dict(batch[0])
+        merged["token"] = "".join(chunk["token"] for chunk in batch)
+        batch.clear()
+        return merged
+    
+    producer = asyncio.ensure_future(pump())
+    try:
+        while True:
+            if batch:
+                try:
+                    chunk = await asyncio.wait_for(queue.get(), max(deadline - time.monotonic(), 0.0))
+                except asyncio.TimeoutError:
+                    yield flush()
+                    continue
+            else:
+                chunk = await queue.get()
+            if chunk is _STREAM_END:
+                break
+            
+            if chunk.get("type") != "token":
+                if batch:
+                    yield flush()
+                yield chunk
+                continue
+            
+            if not batch:
+                deadline = time.monotonic() + max_seconds
+            batch.append(chunk)
+            if len(batch) >= max_chunks or time.monotonic() >= deadline:
+                yield flush()
+        
+        if batch:
+            yield flush()
+        if error is not None:
+            raise error
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
 
 # Pydantic models
 class ChatMessage(BaseModel):
     """Chat message model"""
     message: str
-    session_id: Optional[str] = None
+    session_id: Optional[str] = Field(None, max_length=SESSION_ID_MAX_LENGTH, pattern=SESSION_ID_PATTERN)
     system_prompt: Optional[str] = None
     
     @field_validator('message')
     @classmethod
     def message_must_not_be_empty(cls, v):
-        if not v or not v.strip():
+        if not v or v.isspace():
             raise ValueError('Message must not be empty')
         return v
 
@@ -44,7 +133,7 @@ class ChatResponse(BaseModel):
 
 class ChatSessionCreate(BaseModel):
     """Chat session creation model"""
-    session_id: Optional[str] = None
+    session_id: Optional[str] = Field(None, max_length=SESSION_ID_MAX_LENGTH, pattern=SESSION_ID_PATTERN)
     title: Optional[str] = None
     user_id: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
@@ -90,19 +179,46 @@ class ChatHistoryResponse(BaseModel):
 
 # Chat service is already initialized in main.py
 
+# In-flight send requests keyed by (session_id, message, system_prompt)
+_inflight_messages: Dict[Tuple[str, str, Optional[str]], "asyncio.Task"] = {}
+
+
+async def _process_message_once(chat_message: ChatMessage) -> Dict[str, Any]:
+    """Process a message, sharing the result with identical requests already in flight
+    
+    Retries and double submits of the same message to the same session await
+    the running LLM call instead of starting another one. Requests without a
+    session_id are never merged, since each of them starts its own session.
+    """
+    if not chat_message.session_id:
+        return await chat_service.process_message(
+            message=chat_message.message,
+            session_id=chat_message.session_id,
+            system_prompt=chat_message.system_prompt
+        )
+    
+    key = (chat_message.session_id, chat_message.message, chat_message.system_prompt)
+    task = _inflight_messages.get(key)
+    if task is None:
+        task = asyncio.ensure_future(chat_service.process_message(
+            message=chat_message.message,
+            session_id=chat_message.session_id,
+            system_prompt=chat_message.system_prompt
+        ))
+        _inflight_messages[key] = task
+        task.add_done_callback(lambda _: _inflight_messages.pop(key, None))
+    
+    # Shielded so one client disconnecting does not cancel the call for the others
+    return await asyncio.shield(task)
+
 @router.post("/send", response_model=ChatResponse)
 async def send_message(chat_message: ChatMessage):
     """Send a message to the chatbot and get a response"""
     try:
-        # Debug logging
-        default_logger.info(f"Received send request: message='{chat_message.message}', session_id='{chat_message.session_id}'")
+        default_logger.debug("Received send request: session_id=%s", chat_message.session_id)
         
         # Process message through chat service
-        response = await chat_service.process_message(
-            message=chat_message.message,
-            session_id=chat_message.session_id,
-            system_prompt=chat_message.system_prompt
-        )
+        response = await _process_message_once(chat_message)
         
         return ChatResponse(
             response=response["response"],
@@ -115,16 +231,15 @@ async def send_message(chat_message: ChatMessage):
 @router.post("/stream")
 async def stream_message(chat_message: ChatMessage):
     """Stream a chatbot response"""
-    # Debug logging
-    default_logger.info(f"Received stream request: message='{chat_message.message}', session_id='{chat_message.session_id}'")
+    default_logger.debug("Received stream request: session_id=%s", chat_message.session_id)
     
     async def generate():
-        async for chunk in chat_service.stream_message(
+        async for chunk in _coalesce_tokens(chat_service.stream_message(
             message=chat_message.message,
             session_id=chat_message.session_id,
             system_prompt=chat_message.system_prompt
-        ):
-            yield f"data: {json.dumps(chunk)}\n\n"
+        )):
+            yield SSE_PREFIX + orjson.dumps(chunk) + SSE_SUFFIX
     
     return StreamingResponse(
         generate(),
@@ -166,16 +281,16 @@ async def clear_chat_history(session_id: str):
 async def create_chat_session(session_data: ChatSessionCreate):
     """Create a new chat session"""
     try:
-        default_logger.info(f"Creating session: {session_data}")
+        default_logger.debug("Creating session: session_id=%s", session_data.session_id)
         session = await chat_history_service.create_session(
             session_id=session_data.session_id,
             title=session_data.title,
             user_id=session_data.user_id,
             metadata=session_data.metadata
         )
-        default_logger.info(f"Session created successfully: {session}")
+        default_logger.debug("Session created: %s", session["session_id"])
         return format_success_response(
-            data=ChatSessionResponse(**session).model_dump(),
+            data=session,
             message="Session created successfully"
         )
     except Exception as e:
@@ -194,14 +309,15 @@ async def get_chat_sessions(
 ):
     """Get list of chat sessions"""
     try:
-        # Debug logging
-        default_logger.info(f"Received sessions request: limit={limit}, offset={offset}, page={page}, per_page={per_page}, user_id={user_id}, active_only={active_only}")
+        default_logger.debug(
+            "Received sessions request: limit=%s, offset=%s, page=%s, per_page=%s, user_id=%s, active_only=%s",
+            limit, offset, page, per_page, user_id, active_only
+        )
         
         # Handle page/per_page parameters by converting to limit/offset
         if page is not None and per_page is not None:
             limit = per_page
             offset = (page - 1) * per_page
-            default_logger.info(f"Converted page={page}, per_page={per_page} to limit={limit}, offset={offset}")
         
         sessions = await chat_history_service.get_session_list(
             user_id=user_id,
@@ -211,7 +327,8 @@ async def get_chat_sessions(
         )
         return format_success_response(
             data={
-                "sessions": [ChatSessionResponse(**session) for session in sessions["sessions"]],
+                # Rows are already ChatSessionResponse-shaped dicts from ChatSession.to_dict
+                "sessions": sessions["sessions"],
                 "total_count": sessions["total_count"],
                 "limit": sessions["limit"],
                 "offset": sessions["offset"]
@@ -227,40 +344,68 @@ async def get_chat_sessions(
 async def get_chat_session_full(session_id: str):
     """Get full chat session data including messages and metadata"""
     try:
-        default_logger.info(f"🔍 DEBUG: get_chat_session_full called with session_id: {session_id}")
         session_data = await chat_history_service.get_session_history(session_id)
-        default_logger.info(f"🔍 DEBUG: session_data retrieved: {session_data}")
-        default_logger.info(f"🔍 DEBUG: session keys: {list(session_data.keys()) if session_data else 'None'}")
-        default_logger.info(f"🔍 DEBUG: messages count: {len(session_data.get('messages', [])) if session_data else 0}")
         
-        return ChatHistoryResponse(
-            session=ChatSessionResponse(**session_data["session"]),
-            messages=session_data["messages"],
-            metadata=session_data["metadata"]
-        )
+        # Validated and serialised once through response_model
+        return session_data
     except Exception as e:
-        default_logger.error(f"🔍 DEBUG: Error in get_chat_session_full: {str(e)}")
+        default_logger.error(f"Error getting full chat session {session_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stream_session_messages_ndjson(session_id: str) -> StreamingResponse:
+    """Build an NDJSON StreamingResponse over a session's messages"""
+    messages = chat_history_service.iter_session_messages(session_id)
+    try:
+        # Pull the first row up front so lookup/DB errors still map to an HTTP error
+        first_message = await messages.__anext__()
+    except StopAsyncIteration:
+        first_message = None
+    except NoResultFound:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def generate():
+        # Close the row iterator (and its DB session) even if the client disconnects
+        try:
+            if first_message is None:
+                return
+            yield orjson.dumps(first_message) + b"\n"
+            async for message in messages:
+                yield orjson.dumps(message) + b"\n"
+        finally:
+            await messages.aclose()
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/sessions/{session_id}/messages/stream")
+async def stream_chat_session_messages(session_id: str):
+    """Stream all messages of a chat session as NDJSON"""
+    return await _stream_session_messages_ndjson(session_id)
+
+
 @router.put("/sessions/{session_id}")
 async def update_chat_session(session_id: str, session_data: ChatSessionUpdate):
     """Update a chat session"""
     try:
-        default_logger.info(f"🔍 DEBUG: Updating session {session_id} with data: {session_data}")
+        default_logger.debug("Updating session %s", session_id)
         session = await chat_history_service.update_session(
             session_id=session_id,
             title=session_data.title,
             is_active=session_data.is_active,
             metadata=session_data.metadata
         )
-        default_logger.info(f"🔍 DEBUG: Session updated successfully: {session}")
         return format_success_response(
-            data=ChatSessionResponse(**session).model_dump(),
+            data=session,
             message="Session updated successfully"
         )
     except Exception as e:
-        default_logger.error(f"🔍 DEBUG: Error updating session {session_id}: {str(e)}")
+        default_logger.error(f"Error updating session {session_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -269,6 +414,8 @@ async def delete_chat_session(session_id: str):
     """Permanently delete a chat session and all related data"""
     try:
         success = await chat_history_service.delete_session(session_id)
+        # Keep the chat service's in-memory history from serving deleted messages
+        chat_service.evict_chat_history(session_id)
         if success:
             return format_success_response(
                 message=f"Chat session {session_id} deleted successfully"
@@ -284,6 +431,7 @@ async def delete_all_chat_sessions():
     """Permanently delete all chat sessions and related data"""
     try:
         result = await chat_history_service.delete_all_sessions()
+        chat_service.evict_chat_history()
         return format_success_response(
             message=f"Successfully deleted {result['deleted_sessions']} chat sessions",
             data=result
@@ -301,7 +449,8 @@ async def search_chat_sessions(
     limit: Optional[int] = None,
     offset: Optional[int] = None,
     page: Optional[int] = None,
-    per_page: Optional[int] = None
+    per_page: Optional[int] = None,
+    tag: Optional[str] = None
 ):
     """Search chat sessions by content"""
     try:
@@ -314,7 +463,8 @@ async def search_chat_sessions(
             query=query,
             user_id=user_id,
             limit=limit,
-            offset=offset
+            offset=offset,
+            tag=tag
         )
         return format_success_response(
             data=results,
@@ -329,6 +479,9 @@ async def cleanup_old_sessions(days_old: int = 30):
     """Clean up old inactive sessions"""
     try:
         result = await chat_history_service.cleanup_old_sessions(days_old=days_old)
+        # Keep the chat service's in-memory history from serving deleted messages
+        for session_id in result.pop("deleted_session_ids"):
+            chat_service.evict_chat_history(session_id)
         return format_success_response(
             data=result,
             message=f"Cleanup completed: {result['deleted_sessions']} sessions deleted"
@@ -339,7 +492,14 @@ async def cleanup_old_sessions(days_old: int = 30):
 
 @router.get("/sessions/{session_id}/export")
 async def export_chat_session(session_id: str, format: str = "json"):
-    """Export chat session data"""
+    """Export chat session data
+    
+    format=ndjson streams one message per line instead of building the whole
+    export in memory; json and csv keep the buffered response envelope.
+    """
+    if format.lower() == "ndjson":
+        return await _stream_session_messages_ndjson(session_id)
+    
     try:
         export_data = await chat_history_service.export_session_data(
             session_id=session_id,
@@ -353,20 +513,33 @@ async def export_chat_session(session_id: str, format: str = "json"):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Health probes arriving within this many seconds share one backend check
+HEALTH_CACHE_TTL = 2.0
+_health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
 @router.get("/health")
 async def chat_health_check():
     """Comprehensive chat service health check"""
+    global _health_cache
+    
+    now = time.monotonic()
+    if _health_cache is not None and _health_cache[0] > now:
+        return _health_cache[1]
+    
     try:
-        # Check chat service health
-        chat_health = await chat_service.health_check()
-        
-        # Check database health
-        try:
-            db_health = await database_manager.health_check()
-        except Exception as db_error:
+        # Check chat service and database health concurrently
+        chat_health, db_health = await asyncio.gather(
+            chat_service.health_check(),
+            database_manager.health_check(),
+            return_exceptions=True
+        )
+        if isinstance(chat_health, BaseException):
+            raise chat_health
+        if isinstance(db_health, BaseException):
             db_health = {
                 "status": "unhealthy",
-                "error": str(db_error)
+                "error": str(db_health)
             }
         
         # Overall health status
@@ -377,12 +550,14 @@ async def chat_health_check():
         else:
             overall_status = "unhealthy"
         
-        return {
+        result = {
             "status": overall_status,
             "chat_service": chat_health,
             "database": db_health,
             "timestamp": datetime.utcnow().isoformat()
         }
+        _health_cache = (now + HEALTH_CACHE_TTL, result)
+        return result
     except Exception as e:
         return {
             "status": "unhealthy",
@@ -5,15 +5,16 @@
 """
 
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Depends, Body, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from api.core.config_watcher import config_updater, ConfigChange, ConfigUpdateResult
 from api.core.config_manager import config_manager
 from api.core.utils import handle_exceptions, default_logger, format_success_response
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # 設定更新リクエストモデル
@@ -67,13 +68,34 @@ class ConfigImportRequest(BaseModel):
     format: str = Field(default="toml", description="インポート形式（'toml'または'json'）")
 
 
+def _change_to_dict(change: ConfigChange) -> Dict[str, Any]:
+    """
+    変更履歴をレスポンス用の辞書に変換
+    
+    タイムスタンプはUTCのISO形式で返す（ローカルタイムゾーンの参照を省く）
+    """
+    return {
+        "timestamp": datetime.fromtimestamp(change.timestamp, timezone.utc).isoformat(),
+        "section": change.section,
+        "field": change.field,
+        "old_value": change.old_value,
+        "new_value": change.new_value,
+        "user": change.user,
+        "description": change.description
+    }
+
+
 @router.post("/update", response_model=ConfigUpdateResponse)
-async def update_config(request: ConfigUpdateRequest):
+async def update_config(
+    request: ConfigUpdateRequest,
+    include_changes: bool = Query(False, description="変更履歴をレスポンスに含めるか")
+):
     """
     設定を更新
     
     Args:
         request: 設定更新リクエスト
+        include_changes: Trueの場合のみ最新の変更内容を返す
         
     Returns:
         設定更新レスポンス
@@ -85,17 +107,8 @@ async def update_config(request: ConfigUpdateRequest):
         if result.success:
             # Get change history
             changes = []
-            if hasattr(config_manager, 'change_history') and config_manager.change_history:
-                latest_change = config_manager.change_history[-1]
-                changes = [{
-                    "timestamp": datetime.fromtimestamp(latest_change.timestamp).isoformat(),
-                    "section": latest_change.section,
-                    "field": latest_change.field,
-                    "old_value": latest_change.old_value,
-                    "new_value": latest_change.new_value,
-                    "user": latest_change.user,
-                    "description": latest_change.description
-                }]
+            if include_changes and getattr(config_manager, 'change_history', None):
+                changes = [_change_to_dict(config_manager.change_history[-1])]
             
             return ConfigUpdateResponse(
                 success=True,
@@ -142,12 +155,12 @@ async def get_section(section: str):
         設定セクションの内容
     """
     try:
-        # Get section from config manager
-        section_data = config_manager.get_section(section)
+        # Get section from config manager (cached until the config changes)
+        section_data = config_manager.get_section_dict(section)
         if section_data is None:
             raise HTTPException(status_code=404, detail=f"Section {section} not found")
         
-        return section_data.model_dump()
+        return section_data
     except HTTPException:
         raise
     except Exception as e:
@@ -185,12 +198,16 @@ async def export_config(request: ConfigExportRequest):
 
 
 @router.post("/import")
-async def import_config(request: ConfigImportRequest):
+async def import_config(
+    request: ConfigImportRequest,
+    include_changes: bool = Query(False, description="変更履歴をレスポンスに含めるか")
+):
     """
     設定をインポート
     
     Args:
         request: 設定インポートリクエスト
+        include_changes: Trueの場合のみ変更内容の一覧を返す
         
     Returns:
         設定更新レスポンス
@@ -201,17 +218,8 @@ async def import_config(request: ConfigImportRequest):
         
         if result.success:
             changes = [
-                {
-                    "timestamp": datetime.fromtimestamp(change.timestamp).isoformat(),
-                    "section": change.section,
-                    "field": change.field,
-                    "old_value": change.old_value,
-                    "new_value": change.new_value,
-                    "user": change.user,
-                    "description": change.description
-                }
-                for change in result.changes
-            ]
+                _change_to_dict(change) for change in result.changes
+            ] if include_changes else []
             
             return ConfigUpdateResponse(
                 success=True,
@@ -297,8 +305,7 @@ async def get_all_config():
         すべての設定
     """
     try:
-        # Get all config using config manager
-        config = config_manager.get_config()
-        return config.model_dump()
+        # Get all config using config manager (cached until the config changes)
+        return config_manager.get_config_dict()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting config: {str(e)}")
\ No newline at end of file
@@ -5,18 +5,64 @@ This module provides API endpoints for managing embedding configurations.
 """
 
 import os
+import re
+import asyncio
 import json
+import hashlib
 import httpx
-from typing import Dict, Any, List
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from pydantic import BaseModel
+import orjson
+from dataclasses import dataclass
+from functools import lru_cache
+from urllib.parse import urlparse
+from typing import Dict, Any, List, Optional, Tuple, Union
+from fastapi import APIRouter, HTTPException, UploadFile, File, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, field_validator
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
 
 from api.core.config_manager import settings, config_manager
+from api.core.config_models import EmbeddingConfig as EmbeddingSettings
 from api.core.utils import handle_exceptions, default_logger, format_success_response
 from api.core.qdrant_manager import qdrant_manager
+from api.core.http_client import get_bytes
+from api.core.ttl_cache import TTLCache
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Model listings change rarely; repeat lookups within the TTL skip the upstream call
+MODEL_CACHE_TTL = 60.0
+MODEL_CACHE_MAX_ENTRIES = 32
+_MODEL_CACHE: "TTLCache[Tuple[str, str, str], Tuple[str, ...]]" = TTLCache(MODEL_CACHE_TTL, MODEL_CACHE_MAX_ENTRIES)
+
+# Upper bound for the embed_query call made by /config/test
+EMBEDDING_TEST_TIMEOUT = 15.0
+
+# Name patterns that mark a listed model as an embedding model
+_OLLAMA_EMBED_MODEL_RE = re.compile(r"embed|bge|minilm|nomic|mxbai|snowflake|arctic", re.IGNORECASE)
+_OPENAI_EMBED_MODEL_RE = re.compile(r"embed", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class ModelListSpec:
+    """How to list and filter models for one provider"""
+    label: str
+    path: str
+    list_key: str
+    name_key: str
+    pattern: "re.Pattern[str]"
+    timeout: float
+    send_api_key: bool
+    fallback_to_all: bool
+
+
+# Model listing endpoints per provider; unknown providers use the カスタム entry
+MODEL_LIST_SPECS: Dict[str, ModelListSpec] = {
+    "ollama": ModelListSpec("Ollama", "/api/tags", "models", "name", _OLLAMA_EMBED_MODEL_RE, 30.0, False, True),
+    "openai": ModelListSpec("OpenAI", "/models", "data", "id", _OPENAI_EMBED_MODEL_RE, 10.0, True, False),
+    "カスタム": ModelListSpec("Custom", "/v1/models", "data", "id", _OPENAI_EMBED_MODEL_RE, 10.0, True, False),
+}
+
 
 # Pydantic models
 class EmbeddingConfig(BaseModel):
@@ -26,6 +72,42 @@ class EmbeddingConfig(BaseModel):
     model_name: str
     api_key: str = ""
     dimension: int = 768
+    
+    @field_validator('base_url')
+    @classmethod
+    def normalize_base_url(cls, v):
+        return v.strip().rstrip('/')
+
+# Built (and serialized) once for /config/default, from the config file model's
+# defaults so both stay in step
+DEFAULT_EMBEDDING_CONFIG = EmbeddingConfig(**EmbeddingSettings().model_dump())
+
+_DEFAULT_EMBEDDING_CONFIG_JSON = orjson.dumps(DEFAULT_EMBEDDING_CONFIG.model_dump())
+
+# Fallbacks applied to empty values in the stored embedding section
+_EMBEDDING_DEFAULTS: Dict[str, Any] = DEFAULT_EMBEDDING_CONFIG.model_dump()
+
+# (section dict, resolved config) for the last section dict seen
+_resolved_embedding_config: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+
+
+def _current_embedding_config() -> Dict[str, Any]:
+    """Current embedding settings with defaults applied (do not mutate the result)
+    
+    config_manager.get_section_dict returns the same dict until the config
+    changes, so the resolved dict is reused for as long as that holds.
+    """
+    global _resolved_embedding_config
+    section = config_manager.get_section_dict("embedding") or {}
+    if _resolved_embedding_config is not None and _resolved_embedding_config[0] is section:
+        return _resolved_embedding_config[1]
+    
+    resolved = {
+        field: section.get(field) or default
+        for field, default in _EMBEDDING_DEFAULTS.items()
+    }
+    _resolved_embedding_config = (section, resolved)
+    return resolved
 
 class EmbeddingConfigResponse(BaseModel):
     """Embedding configuration response model"""
@@ -33,6 +115,12 @@ class EmbeddingConfigResponse(BaseModel):
     available_models: List[str]
     status: str
 
+class ModelsForProviderRequest(BaseModel):
+    """Request body for /models/for-provider"""
+    provider: Optional[str] = "ollama"
+    base_url: Optional[str] = ""
+    api_key: Optional[str] = ""
+
 class ConfigStatus(BaseModel):
     """Configuration status model"""
     status: str
@@ -42,134 +130,105 @@ class ConfigStatus(BaseModel):
     new_dimension: int = None
 
 
-async def get_embedding_models_from_api(base_url: str, api_key: str = "", provider: str = "ollama") -> List[str]:
+def _model_cache_key(base_url: str, api_key: str, provider: str) -> Tuple[str, str, str]:
+    """Cache key for a model listing; the API key is stored only as a hash"""
+    return (provider, base_url, hashlib.sha256(api_key.encode()).hexdigest())
+
+
+async def get_embedding_models_from_api(
+    base_url: str,
+    api_key: str = "",
+    provider: str = "ollama",
+    refresh: bool = False
+) -> List[str]:
+    """Get available embedding models, served from a short-lived cache
+    
+    Args:
+        refresh: Skip the cache and fetch from the API (the result is cached again)
+    """
+    # Normalized once here so the fetchers and the cache key see one canonical form
+    base_url = base_url.strip().rstrip('/')
+    
+    # A URL without an http(s) scheme or host can never answer; skip the network
+    parsed = urlparse(base_url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        default_logger.warning("Invalid base_url skipped: %r", base_url)
+        return []
+    
+    key = _model_cache_key(base_url, api_key, provider)
+    
+    async def fetch(_stale: Optional[Tuple[str, ...]]) -> Optional[Tuple[str, ...]]:
+        # Failures come back as an empty list; only successful listings are cached
+        return tuple(await _fetch_embedding_models_from_api(base_url, api_key, provider)) or None
+    
+    return list(await _MODEL_CACHE.get_or_fetch(key, fetch, refresh=refresh) or ())
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.1, max=1.0),
+    retry=retry_if_exception_type((httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError)),
+    reraise=True
+)
+async def _get_model_listing(url: str, headers: Dict[str, str], timeout: float) -> Tuple[int, httpx.Headers, bytes]:
+    """GET a model listing, retrying dropped or refused connections (the request is idempotent)"""
+    return await get_bytes(url, headers=headers, timeout=timeout)
+
+
+async def _fetch_embedding_models_from_api(base_url: str, api_key: str = "", provider: str = "ollama") -> List[str]:
     """Get available embedding models from the specified API"""
+    spec = MODEL_LIST_SPECS.get(provider, MODEL_LIST_SPECS["カスタム"])
+    headers = {"Content-Type": "application/json"}
+    if spec.send_api_key and api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    
+    models_url = f"{base_url}{spec.path}"
+    default_logger.info("Fetching %s embedding models from: %s", spec.label, models_url)
+    
     try:
-        if provider == "ollama":
-            # For Ollama, get available models
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {"Content-Type": "application/json"}
-                
-                # Try Ollama API
-                ollama_url = f"{base_url.rstrip('/')}/api/tags"
-                default_logger.info(f"Fetching Ollama embedding models from: {ollama_url}")
-                
-                try:
-                    response = await client.get(ollama_url, headers=headers)
-                    default_logger.info(f"Ollama API response status: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        models = data.get("models", [])
-                        default_logger.info(f"Raw Ollama response: {data}")
-                        default_logger.info(f"Found {len(models)} total models from Ollama")
-                        
-                        # Filter models that are suitable for embedding
-                        embedding_models = []
-                        for model in models:
-                            name = model.get("name", "")
-                            default_logger.debug(f"Checking model: {name}")
-                            # More comprehensive embedding model detection
-                            if any(keyword in name.lower() for keyword in ["embed", "bge", "minilm", "nomic", "mxbai", "snowflake", "arctic"]):
-                                embedding_models.append(name)
-                                default_logger.debug(f"Added embedding model: {name}")
-                        
-                        # If no specific embedding models found, return all models (user can choose)
-                        if not embedding_models:
-                            default_logger.info("No specific embedding models found, returning all models")
-                            embedding_models = [model.get("name", "") for model in models if model.get("name")]
-                        
-                        default_logger.info(f"Filtered to {len(embedding_models)} embedding models: {embedding_models}")
-                        return embedding_models
-                    else:
-                        default_logger.warning(f"Ollama API endpoint returned status {response.status_code}: {response.text}")
-                        return []
-                        
-                except httpx.ConnectError as e:
-                    default_logger.error(f"Connection error to Ollama at {ollama_url}: {e}")
-                    return []
-                except httpx.TimeoutException as e:
-                    default_logger.error(f"Timeout error connecting to Ollama at {ollama_url}: {e}")
-                    return []
-                except Exception as e:
-                    default_logger.error(f"Unexpected error connecting to Ollama: {e}")
-                    return []
+        status_code, _, body = await _get_model_listing(models_url, headers, spec.timeout)
+        default_logger.debug("%s API response status: %s", spec.label, status_code)
         
-        elif provider == "openai":
-            # For OpenAI, try to get models from API
-            try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    headers = {"Content-Type": "application/json"}
-                    if api_key:
-                        headers["Authorization"] = f"Bearer {api_key}"
-                    
-                    models_url = f"{base_url.rstrip('/')}/models"
-                    default_logger.info(f"Fetching OpenAI embedding models from: {models_url}")
-                    response = await client.get(models_url, headers=headers)
-                    
-                    default_logger.info(f"OpenAI API response status: {response.status_code}")
-                    if response.status_code == 200:
-                        data = response.json()
-                        models = data.get("data", [])
-                        default_logger.info(f"Found {len(models)} total models from OpenAI")
-                        # Filter models that might be embedding models
-                        embedding_models = []
-                        for model in models:
-                            model_id = model.get("id", "")
-                            if any(keyword in model_id.lower() for keyword in ["embed", "text-embedding"]):
-                                embedding_models.append(model_id)
-                        
-                        default_logger.info(f"Filtered to {len(embedding_models)} embedding models: {embedding_models}")
-                        return embedding_models
-                    else:
-                        default_logger.warning(f"OpenAI API returned status {response.status_code}: {response.text}")
-                        return []
-            except Exception as e:
-                default_logger.error(f"Error fetching OpenAI embedding models: {e}")
-                return []
+        if status_code != 200:
+            default_logger.warning("%s API returned status %s: %s", spec.label, status_code, body[:500].decode(errors='replace'))
+            return []
         
-        else:
-            # For カスタム, try to get models
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {"Content-Type": "application/json"}
-                if api_key:
-                    headers["Authorization"] = f"Bearer {api_key}"
-                
-                models_url = f"{base_url.rstrip('/')}/v1/models"
-                response = await client.get(models_url, headers=headers)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    models = data.get("data", [])
-                    # Filter models that might be embedding models
-                    embedding_models = []
-                    for model in models:
-                        model_id = model.get("id", "")
-                        if any(keyword in model_id.lower() for keyword in ["embed", "text-embedding"]):
-                            embedding_models.append(model_id)
-                    
-                    return embedding_models if embedding_models else []
-                else:
-                    return []
+        data = orjson.loads(body)
+        models = data.get(spec.list_key, [])
+        default_logger.debug("Found %d total models from %s", len(models), spec.label)
+        
+        # Filter models that are suitable for embedding
+        names = [name for model in models if (name := model.get(spec.name_key))]
+        embedding_models = [name for name in names if spec.pattern.search(name)]
+        
+        # If no specific embedding models found, return all models (user can choose)
+        if not embedding_models and spec.fallback_to_all:
+            default_logger.info("No specific embedding models found, returning all models")
+            embedding_models = names
+        
+        default_logger.info("Filtered to %d embedding models", len(embedding_models))
+        default_logger.debug("Embedding models: %s", embedding_models)
+        return embedding_models
     
-    except Exception as e:
-        default_logger.error(f"Error getting embedding models from API {base_url} (provider: {provider}): {e}")
-        default_logger.error(f"Exception type: {type(e).__name__}")
-        import traceback
-        default_logger.error(f"Traceback: {traceback.format_exc()}")
+    except httpx.ConnectError as e:
+        default_logger.error("Connection error to %s at %s: %s", spec.label, models_url, e)
+        return []
+    except httpx.TimeoutException as e:
+        default_logger.error("Timeout error connecting to %s at %s: %s", spec.label, models_url, e)
+        return []
+    except (httpx.HTTPError, ValueError, AttributeError, TypeError) as e:
+        # Other transport/decode failures, or a payload that is not the expected shape
+        default_logger.error(
+            "Error getting embedding models from API %s (provider: %s): %s: %s",
+            base_url, provider, type(e).__name__, e
+        )
         return []
 
 @router.get("/config", response_model=EmbeddingConfigResponse)
 async def get_embedding_config():
     """Get current embedding configuration"""
     # Get current configuration from config manager
-    embedding_config = {
-        "provider": config_manager.get_value("embedding", "provider") or "ollama",
-        "base_url": config_manager.get_value("embedding", "base_url") or "http://localhost:11434",
-        "model_name": config_manager.get_value("embedding", "model_name") or "nomic-embed-text:latest",
-        "api_key": config_manager.get_value("embedding", "api_key") or "",
-        "dimension": config_manager.get_value("embedding", "dimension") or 768
-    }
+    embedding_config = _current_embedding_config()
     
     # Get available models from the configured API
     models = await get_embedding_models_from_api(
@@ -179,7 +238,8 @@ async def get_embedding_config():
     )
     
     return EmbeddingConfigResponse(
-        config=EmbeddingConfig(**embedding_config),
+        # Values come from the already-validated config section
+        config=EmbeddingConfig.model_construct(**embedding_config),
         available_models=models,
         status="active"
     )
@@ -188,27 +248,33 @@ async def get_embedding_config():
 async def update_embedding_config(config: EmbeddingConfig):
     """Update embedding configuration"""
     # Get current dimension for comparison
-    current_dimension = config_manager.get_value("embedding", "dimension") or 768
+    current_dimension = _current_embedding_config()["dimension"]
     
-    # Update configuration using config manager
-    result = config_manager.set_value("embedding", "provider", config.provider)
+    # A changed endpoint or key makes the cached listings stale
+    _MODEL_CACHE.clear()
+    
+    # Update configuration using config manager (one save for all fields)
+    result = config_manager.set_values("embedding", {
+        "provider": config.provider,
+        "base_url": config.base_url,
+        "model_name": config.model_name,
+        "api_key": config.api_key,
+        "dimension": config.dimension
+    })
     if not result.success:
         return ConfigStatus(
             status="error",
             message=result.message
         )
     
-    config_manager.set_value("embedding", "base_url", config.base_url)
-    config_manager.set_value("embedding", "model_name", config.model_name)
-    config_manager.set_value("embedding", "api_key", config.api_key)
-    config_manager.set_value("embedding", "dimension", config.dimension)
-    
     # Update environment variables
-    os.environ["EMBEDDING_PROVIDER"] = config.provider
-    os.environ["EMBEDDING_BASE_URL"] = config.base_url
-    os.environ["EMBEDDING_MODEL_NAME"] = config.model_name
-    os.environ["EMBEDDING_API_KEY"] = config.api_key
-    os.environ["EMBEDDING_DIMENSION"] = str(config.dimension)
+    os.environ.update({
+        "EMBEDDING_PROVIDER": config.provider,
+        "EMBEDDING_BASE_URL": config.base_url,
+        "EMBEDDING_MODEL_NAME": config.model_name,
+        "EMBEDDING_API_KEY": config.api_key,
+        "EMBEDDING_DIMENSION": str(config.dimension)
+    })
     
     # Check if dimension changed
     vector_db_recreated = False
@@ -251,73 +317,106 @@ async def update_embedding_config(config: EmbeddingConfig):
             message="Embedding configuration updated successfully"
         )
 
+@lru_cache(maxsize=None)
+def _get_embedding_classes() -> Tuple[type, type]:
+    """Resolve the langchain embedding classes once per process
+    
+    Imported lazily (not at module load) to avoid circular imports and to keep
+    langchain off the startup path.
+    """
+    try:
+        from langchain_ollama import OllamaEmbeddings
+    except ImportError:
+        from langchain_community.embeddings import OllamaEmbeddings
+    
+    try:
+        from langchain_openai import OpenAIEmbeddings
+    except ImportError:
+        from langchain_community.embeddings import OpenAIEmbeddings
+    
+    return OllamaEmbeddings, OpenAIEmbeddings
+
+@lru_cache(maxsize=8)
+def _get_test_embedding(provider: str, model_name: str, base_url: str, api_key: str):
+    """Create (or reuse) the embedding client used by /config/test for a given config"""
+    OllamaEmbeddings, OpenAIEmbeddings = _get_embedding_classes()
+    
+    # Create a test embedding instance based on provider
+    if provider == "ollama":
+        return OllamaEmbeddings(
+            model=model_name,
+            base_url=base_url
+        )
+    elif provider == "openai":
+        return OpenAIEmbeddings(
+            model=model_name,
+            openai_api_key=api_key
+        )
+    else:
+        # For カスタム, try OpenAIEmbeddings with custom base URL
+        return OpenAIEmbeddings(
+            model=model_name,
+            openai_api_key=api_key,
+            openai_api_base=base_url
+        )
+
 @router.post("/config/test", response_model=ConfigStatus)
 async def test_embedding_config(config: EmbeddingConfig):
     """Test embedding configuration"""
     try:
-        # Import here to avoid circular imports
-        try:
-            from langchain_ollama import OllamaEmbeddings
-        except ImportError:
-            from langchain_community.embeddings import OllamaEmbeddings
-        
-        try:
-            from langchain_openai import OpenAIEmbeddings
-        except ImportError:
-            from langchain_community.embeddings import OpenAIEmbeddings
-        
-        # Create a test embedding instance based on provider
-        if config.provider == "ollama":
-            test_embedding = OllamaEmbeddings(
-                model=config.model_name,
-                base_url=config.base_url
-            )
-        elif config.provider == "openai":
-            test_embedding = OpenAIEmbeddings(
-                model=config.model_name,
-                openai_api_key=config.api_key
-            )
-        else:
-            # For カスタム, try OpenAIEmbeddings with custom base URL
-            test_embedding = OpenAIEmbeddings(
-                model=config.model_name,
-                openai_api_key=config.api_key,
-                openai_api_base=config.base_url
-            )
+        test_embedding = _get_test_embedding(
+            config.provider,
+            config.model_name,
+            config.base_url,
+            config.api_key
+        )
         
-        # Test with a simple text
-        test_vector = test_embedding.embed_query("Hello, this is a test.")
+        # Test with a simple text; embed_query is a blocking network call, so run
+        # it off the event loop
+        test_vector = await asyncio.wait_for(
+            asyncio.to_thread(test_embedding.embed_query, "Hello, this is a test."),
+            timeout=EMBEDDING_TEST_TIMEOUT
+        )
         
-        if test_vector and len(test_vector) > 0:
-            # Check if dimension matches expected
-            if len(test_vector) == config.dimension:
-                return ConfigStatus(
-                    status="success",
-                    message=f"Embedding configuration test successful. Generated {len(test_vector)} dimensions."
-                )
-            else:
-                return ConfigStatus(
-                    status="warning",
-                    message=f"Embedding configuration works but dimension mismatch. Expected {config.dimension}, got {len(test_vector)}"
-                )
-        else:
+        dimension = len(test_vector) if test_vector else 0
+        if dimension == 0:
             return ConfigStatus(
                 status="error",
                 message="Embedding did not return a valid vector"
             )
+        
+        # Check if dimension matches expected
+        if dimension == config.dimension:
+            return ConfigStatus(
+                status="success",
+                message=f"Embedding configuration test successful. Generated {dimension} dimensions."
+            )
+        return ConfigStatus(
+            status="warning",
+            message=f"Embedding configuration works but dimension mismatch. Expected {config.dimension}, got {dimension}"
+        )
+    except asyncio.TimeoutError:
+        return ConfigStatus(
+            status="error",
+            message=f"Embedding configuration test timed out after {EMBEDDING_TEST_TIMEOUT:.0f} seconds"
+        )
     except Exception as e:
         return ConfigStatus(
             status="error",
             message=f"Embedding configuration test failed: {str(e)}"
         )
 
-@router.post("/models/for-provider", response_model=List[str])
-async def get_models_for_provider(request: Dict[str, Any]):
+# The model list endpoints return ORJSONResponse directly (no response_model
+# validation pass); the schema is declared here for OpenAPI only
+MODEL_LIST_RESPONSES: Dict[Union[int, str], Dict[str, Any]] = {200: {"model": List[str]}}
+
+@router.post("/models/for-provider", responses=MODEL_LIST_RESPONSES)
+async def get_models_for_provider(request: ModelsForProviderRequest):
     """プロバイダー指定によるモデル取得"""
     try:
-        provider = request.get("provider", "ollama")
-        base_url = request.get("base_url", "")
-        api_key = request.get("api_key", "")
+        provider = request.provider or "ollama"
+        base_url = request.base_url or ""
+        api_key = request.api_key or ""
         
         # プロバイダーに応じたデフォルトベースURLを設定
         if not base_url:
@@ -328,60 +427,62 @@ async def get_models_for_provider(request: Dict[str, Any]):
             else:  # カスタム
                 base_url = "http://localhost:11434/v1"
         
-        default_logger.info(f"Getting models for provider: {provider}, Base URL: {base_url}")
+        default_logger.debug("Getting models for provider: %s, Base URL: %s", provider, base_url)
         
         # 指定されたプロバイダーからモデルを取得
         models = await get_embedding_models_from_api(base_url, api_key, provider)
         
-        default_logger.info(f"Models for provider {provider}: {models} (count: {len(models)})")
+        default_logger.debug("Models for provider %s: %s (count: %d)", provider, models, len(models))
         
-        return models
+        return ORJSONResponse(models)
     except Exception as e:
         default_logger.error(f"Error getting models for provider: {e}")
         import traceback
         default_logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error getting models for provider: {str(e)}")
     
-@router.get("/models", response_model=List[str])
+@router.get("/models", responses=MODEL_LIST_RESPONSES)
 async def get_available_embedding_models():
     """Get list of available embedding models"""
     try:
         # Get current configuration
-        provider = config_manager.get_value("embedding", "provider") or "ollama"
-        base_url = config_manager.get_value("embedding", "base_url") or "http://localhost:11434"
-        api_key = config_manager.get_value("embedding", "api_key") or ""
+        cfg = _current_embedding_config()
+        provider = cfg["provider"]
+        base_url = cfg["base_url"]
+        api_key = cfg["api_key"]
         
-        default_logger.info(f"Getting available embedding models - Provider: {provider}, Base URL: {base_url}")
+        default_logger.debug("Getting available embedding models - Provider: %s, Base URL: %s", provider, base_url)
         
         # Get models from the configured API
         models = await get_embedding_models_from_api(base_url, api_key, provider)
         
-        default_logger.info(f"Final models list for API response: {models} (count: {len(models)})")
+        default_logger.debug("Final models list for API response: %s (count: %d)", models, len(models))
         
-        return models
+        return ORJSONResponse(models)
     except Exception as e:
         default_logger.error(f"Error in get_available_embedding_models endpoint: {e}")
         import traceback
         default_logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error getting available embedding models: {str(e)}")
 
-@router.post("/models/refresh", response_model=List[str])
+@router.post("/models/refresh", responses=MODEL_LIST_RESPONSES)
 async def refresh_available_embedding_models():
     """Refresh list of available embedding models from the embedding API"""
     try:
         # Get current configuration
-        provider = config_manager.get_value("embedding", "provider") or "ollama"
-        base_url = config_manager.get_value("embedding", "base_url") or "http://localhost:11434"
-        api_key = config_manager.get_value("embedding", "api_key") or ""
+        cfg = _current_embedding_config()
+        provider = cfg["provider"]
+        base_url = cfg["base_url"]
+        api_key = cfg["api_key"]
         
         default_logger.info(f"Refreshing available embedding models - Provider: {provider}, Base URL: {base_url}")
         
-        # Get models from the configured API
-        models = await get_embedding_models_from_api(base_url, api_key, provider)
+        # Get models from the configured API, bypassing the cache
+        models = await get_embedding_models_from_api(base_url, api_key, provider, refresh=True)
         
-        default_logger.info(f"Final refreshed models list for API response: {models} (count: {len(models)})")
+        default_logger.debug("Final refreshed models list for API response: %s (count: %d)", models, len(models))
         
-        return models
+        return ORJSONResponse(models)
     except Exception as e:
         default_logger.error(f"Error in refresh_available_embedding_models endpoint: {e}")
         import traceback
@@ -391,13 +492,9 @@ async def refresh_available_embedding_models():
 @router.get("/config/default", response_model=EmbeddingConfig)
 async def get_default_embedding_config():
     """Get default embedding configuration"""
-    return EmbeddingConfig(
-        provider="ollama",
-        base_url="http://localhost:11434",
-        model_name="nomic-embed-text:latest",
-        api_key="",
-        dimension=768
-    )
+    # Returning a Response skips response_model validation and encoding;
+    # response_model stays on the route for the OpenAPI schema
+    return Response(content=_DEFAULT_EMBEDDING_CONFIG_JSON, media_type="application/json")
 
 @router.post("/config/reset", response_model=ConfigStatus)
 async def reset_embedding_config():
@@ -406,12 +503,17 @@ async def reset_embedding_config():
     success = config_manager.reset_to_defaults()
     
     if success:
+        _MODEL_CACHE.clear()
+        
         # Update environment variables
-        os.environ["EMBEDDING_PROVIDER"] = config_manager.get_value("embedding", "provider") or "ollama"
-        os.environ["EMBEDDING_BASE_URL"] = config_manager.get_value("embedding", "base_url") or "http://localhost:11434"
-        os.environ["EMBEDDING_MODEL_NAME"] = config_manager.get_value("embedding", "model_name") or "nomic-embed-text:latest"
-        os.environ["EMBEDDING_API_KEY"] = config_manager.get_value("embedding", "api_key") or ""
-        os.environ["EMBEDDING_DIMENSION"] = str(config_manager.get_value("embedding", "dimension") or 768)
+        cfg = _current_embedding_config()
+        os.environ.update({
+            "EMBEDDING_PROVIDER": cfg["provider"],
+            "EMBEDDING_BASE_URL": cfg["base_url"],
+            "EMBEDDING_MODEL_NAME": cfg["model_name"],
+            "EMBEDDING_API_KEY": cfg["api_key"],
+            "EMBEDDING_DIMENSION": str(cfg["dimension"])
+        })
         
         return ConfigStatus(
             status="success",
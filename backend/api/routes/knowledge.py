@@ -5,19 +5,116 @@ This module provides API endpoints for managing knowledge base.
 """
 
 import os
+import uuid
+import codecs
+import orjson
 import shutil
 import tempfile
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.schema import Document
 
-from api.core.qdrant_manager import qdrant_manager
+from api.core.qdrant_manager import qdrant_manager, INGEST_BATCH_SIZE
 from api.core.config_manager import settings
 from api.core.config_manager import config_manager
 from api.core.utils import handle_exceptions, default_logger, format_success_response
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Uploads are read in blocks of this size instead of being buffered whole
+UPLOAD_READ_SIZE = 64 * 1024
+# Chunking of uploaded files (same defaults as directory ingestion)
+UPLOAD_CHUNK_SIZE = 1000
+UPLOAD_CHUNK_OVERLAP = 200
+# Text accumulated before the splitter is run over it
+UPLOAD_SPLIT_WINDOW = 16 * UPLOAD_CHUNK_SIZE
+
+
+async def _iter_upload_text(file: UploadFile) -> AsyncIterator[str]:
+    """Read an uploaded file block by block, decoding it as UTF-8"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        block = await file.read(UPLOAD_READ_SIZE)
+        if not block:
+            break
+        text = decoder.decode(block)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+async def _iter_upload_chunks(file: UploadFile) -> AsyncIterator[str]:
+    """Split an uploaded file into chunks while it is being read"""
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=UPLOAD_CHUNK_SIZE,
+        chunk_overlap=UPLOAD_CHUNK_OVERLAP,
+        add_start_index=True
+    )
+    buffer = ""
+    async for text in _iter_upload_text(file):
+        buffer += text
+        if len(buffer) < UPLOAD_SPLIT_WINDOW:
+            continue
+        chunks = text_splitter.create_documents([buffer])
+        last_start = chunks[-1].metadata["start_index"]
+        if len(chunks) > 1 and last_start > 0:
+            # The last chunk may continue in the next block, so split it again with more text.
+            # The raw text from its start offset is kept: chunks are whitespace-stripped, and
+            # reusing one would glue its last word to the first word of the next block.
+            for chunk in chunks[:-1]:
+                yield chunk.page_content
+            buffer = buffer[last_start:]
+    
+    if buffer:
+        for chunk in text_splitter.split_text(buffer):
+            yield chunk
+
+
+async def _ingest_upload(file: UploadFile, doc_metadata: Dict[str, Any]) -> bool:
+    """Add an uploaded file to the knowledge base chunk batch by chunk batch
+    
+    The upload is all or nothing: if reading, decoding or a later batch fails,
+    the points already written for this file are deleted again.
+    """
+    written_ids: List[str] = []
+    batch: List[Document] = []
+    batch_ids: List[str] = []
+    
+    async def flush() -> bool:
+        # IDs are recorded before the write, since a failed batch may be partially stored
+        written_ids.extend(batch_ids)
+        success = await qdrant_manager.add_documents_batch(batch, ids=batch_ids)
+        batch.clear()
+        batch_ids.clear()
+        return success
+    
+    success = True
+    try:
+        async for chunk in _iter_upload_chunks(file):
+            batch.append(Document(page_content=chunk, metadata=dict(doc_metadata)))
+            batch_ids.append(uuid.uuid4().hex)
+            if len(batch) >= INGEST_BATCH_SIZE:
+                success = await flush()
+                if not success:
+                    break
+        if success and batch:
+            success = await flush()
+    except Exception:
+        # e.g. invalid UTF-8 partway through the file
+        if written_ids:
+            await qdrant_manager.delete_documents_by_ids(written_ids)
+        raise
+    
+    if not success and written_ids:
+        await qdrant_manager.delete_documents_by_ids(written_ids)
+    return success and bool(written_ids)
+
 
 # Pydantic models
 class KnowledgeDocument(BaseModel):
@@ -59,10 +156,6 @@ class DocumentList(BaseModel):
 async def add_document(document: KnowledgeDocument):
     """Add a single document to the knowledge base"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # Add document
         success = await qdrant_manager.add_document(
             content=document.content,
@@ -99,31 +192,18 @@ async def upload_document(
 ):
     """Upload a document file to the knowledge base"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # Parse metadata if provided
         doc_metadata = {}
         if metadata:
-            import json
             try:
-                doc_metadata = json.loads(metadata)
-            except json.JSONDecodeError:
+                doc_metadata = orjson.loads(metadata)
+            except orjson.JSONDecodeError:
                 doc_metadata = {"source": "uploaded_file"}
         else:
             doc_metadata = {"source": "uploaded_file", "filename": file.filename}
         
-        # Read file content
-        content = await file.read()
-        text_content = content.decode("utf-8")
-        
-        # Add document
-        success = await qdrant_manager.add_document(
-            content=text_content,
-            metadata=doc_metadata,
-            doc_id=file.filename
-        )
+        # Stream the file into chunks and add them in batches
+        success = await _ingest_upload(file, doc_metadata)
         
         if success:
             # Get collection info to return document count
@@ -156,10 +236,6 @@ async def add_documents_from_directory(
 ):
     """Add documents from a directory to the knowledge base"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # Check if directory exists
         if not os.path.exists(directory_path):
             return KnowledgeResponse(
@@ -200,10 +276,6 @@ async def add_documents_from_directory(
 async def search_knowledge(search_request: KnowledgeSearchRequest):
     """Search the knowledge base"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # Search knowledge base
         results = await qdrant_manager.search_similar_documents(
             query=search_request.query,
@@ -225,10 +297,6 @@ async def search_knowledge(search_request: KnowledgeSearchRequest):
 async def get_collection_info():
     """Get information about the knowledge collection"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # Get collection info
         info = await qdrant_manager.get_collection_info()
         
@@ -249,10 +317,6 @@ async def get_collection_info():
 async def list_documents(limit: int = 100):
     """List documents in the knowledge collection"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # List documents
         documents = await qdrant_manager.list_documents(limit=limit)
         
@@ -270,10 +334,6 @@ async def list_documents(limit: int = 100):
 async def delete_document(doc_id: str):
     """Delete a document from the knowledge base"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # Delete document
         success = await qdrant_manager.delete_document_by_id(doc_id)
         
@@ -302,10 +362,6 @@ async def delete_document(doc_id: str):
 async def clear_collection():
     """Clear all documents from the knowledge collection"""
     try:
-        # Initialize Qdrant manager if not already initialized
-        if not qdrant_manager._initialized:
-            await qdrant_manager.initialize()
-        
         # Clear collection
         success = await qdrant_manager.clear_collection()
         
@@ -5,17 +5,24 @@ This module provides API endpoints for managing LLM configurations.
 """
 
 import os
-import json
-import httpx
-from typing import Dict, Any, List
+import asyncio
+import hashlib
+import orjson
+from urllib.parse import urlparse
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from langchain_openai import ChatOpenAI
 
 from api.core.config_manager import settings, config_manager
 from api.core.utils import handle_exceptions, default_logger, format_success_response
+from api.core.http_client import get_bytes
+from api.core.ttl_cache import TTLCache
+from api.services.chat_service import chat_service
 
 # Create router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Pydantic models
 class LLMConfig(BaseModel):
@@ -54,108 +61,154 @@ current_llm_config = {
     "presence_penalty": 0.0
 }
 
+# Model listings change rarely; repeat lookups within the TTL skip the upstream call.
+# Expired entries are revalidated with their ETag.
+MODELS_CACHE_TTL = 300.0
+MODELS_CACHE_MAX_ENTRIES = 32
+# A cached listing: (models, listing URL, ETag)
+ModelListing = Tuple[Tuple[str, ...], str, Optional[str]]
+_models_cache: "TTLCache[Tuple[str, str], ModelListing]" = TTLCache(MODELS_CACHE_TTL, MODELS_CACHE_MAX_ENTRIES)
+
+# Providers without a public models endpoint
+ANTHROPIC_MODELS = (
+    "claude-3-5-sonnet-20241022",
+    "claude-3-5-haiku-20241022",
+    "claude-3-sonnet-20240229",
+    "claude-3-opus-20240229",
+    "claude-3-haiku-20240307"
+)
+GEMINI_MODELS = (
+    "gemini-1.5-pro",
+    "gemini-1.5-flash",
+    "gemini-pro",
+    "gemini-pro-vision"
+)
+# Common OpenAI models returned when the OpenAI listing fails
+OPENAI_FALLBACK_MODELS = (
+    "gpt-4o",
+    "gpt-4o-mini",
+    "gpt-4-turbo",
+    "gpt-4",
+    "gpt-3.5-turbo"
+)
+
+# Upper bound and reply length for the completion made by /config/test
+LLM_TEST_TIMEOUT = 10.0
+LLM_TEST_MAX_TOKENS = 1
+
+# Fixed model lists by API host
+_STATIC_MODELS: Dict[str, Tuple[str, ...]] = {
+    "api.anthropic.com": ANTHROPIC_MODELS,
+    "generativelanguage.googleapis.com": GEMINI_MODELS,
+}
+# Hosts served by OpenAI itself (listing at {api_base}/models, with a fallback list)
+_OPENAI_HOSTS = frozenset({"api.openai.com"})
+
+
+def _models_cache_key(api_base: str, api_key: str) -> Tuple[str, str]:
+    """Cache key for a model listing; the API key is stored only as a hash"""
+    return (api_base, hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest())
+
+
 async def get_models_from_api(api_base: str, api_key: str = "") -> List[str]:
     """Get available models from the specified API Base URL"""
     try:
         # Normalize API base URL
         api_base = api_base.rstrip('/')
         
-        # Check provider based on API base URL and return appropriate models
-        if "anthropic.com" in api_base:
-            # Anthropic models - they don't have a public models endpoint
-            return [
-                "claude-3-5-sonnet-20241022",
-                "claude-3-5-haiku-20241022", 
-                "claude-3-sonnet-20240229",
-                "claude-3-opus-20240229",
-                "claude-3-haiku-20240307"
-            ]
-        elif "openai.com" in api_base:
-            # OpenAI models
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {"Content-Type": "application/json"}
-                if api_key:
-                    headers["Authorization"] = f"Bearer {api_key}"
-                
-                models_url = f"{api_base}/models"
-                response = await client.get(models_url, headers=headers)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    models = data.get("data", [])
-                    return [model["id"] for model in models if "id" in model]
-                else:
-                    # Fallback to common OpenAI models
-                    return [
-                        "gpt-4o",
-                        "gpt-4o-mini", 
-                        "gpt-4-turbo",
-                        "gpt-4",
-                        "gpt-3.5-turbo"
-                    ]
-        elif "generativelanguage.googleapis.com" in api_base:
-            # Google Gemini models
-            return [
-                "gemini-1.5-pro",
-                "gemini-1.5-flash",
-                "gemini-pro",
-                "gemini-pro-vision"
-            ]
+        # Check provider based on the API host and return appropriate models
+        host = urlparse(api_base).hostname or ""
+        static_models = _STATIC_MODELS.get(host)
+        if static_models is not None:
+            return list(static_models)
         
-        # For other APIs, try OpenAI-compatible endpoint first
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Set headers
-            headers = {"Content-Type": "application/json"}
-            if api_key:
-                headers["Authorization"] = f"Bearer {api_key}"
-            
-            # Try OpenAI-compatible models endpoint first
-            # Handle the case where api_base already ends with /v1
-            if api_base.endswith('/v1'):
-                models_url = f"{api_base}/models"
-            else:
-                models_url = f"{api_base}/v1/models"
-            
-            response = await client.get(models_url, headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                models = data.get("data", [])
-                return [model["id"] for model in models if "id" in model]
-            else:
-                # Log detailed error information for debugging
-                default_logger.warning(f"OpenAI API endpoint returned status {response.status_code} for {models_url}")
-                if response.status_code != 401:
-                    default_logger.warning(f"Response content: {response.text}")
-            
-            # If OpenAI endpoint fails, try Ollama API
-            if "/v1" in api_base:
-                ollama_base = api_base.replace("/v1", "")
-            else:
-                ollama_base = api_base
-            
-            ollama_url = f"{ollama_base}/api/tags"
-            response = await client.get(ollama_url, headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                models = data.get("models", [])
-                return [model["name"] for model in models]
-            else:
-                # Log detailed error information for debugging
-                default_logger.warning(f"Ollama API endpoint returned status {response.status_code} for {ollama_url}")
-                if response.status_code != 401:
-                    default_logger.warning(f"Response content: {response.text}")
-            
-            # If both APIs fail, return empty list instead of fallback models
-            default_logger.info(f"Both API endpoints failed for {api_base}, returning empty model list")
-            return []
+        is_openai = host in _OPENAI_HOSTS
+        
+        async def fetch(stale: Optional[ModelListing]) -> Optional[ModelListing]:
+            return await _fetch_model_listing(api_base, api_key, is_openai, stale)
+        
+        listing = await _models_cache.get_or_fetch(_models_cache_key(api_base, api_key), fetch)
+        if listing is not None:
+            return list(listing[0])
+        
+        # Failed listings are not cached
+        if is_openai:
+            # Fallback to common OpenAI models
+            return list(OPENAI_FALLBACK_MODELS)
+        
+        # If both APIs fail, return empty list instead of fallback models
+        default_logger.info(f"Both API endpoints failed for {api_base}, returning empty model list")
+        return []
             
     except Exception as e:
         default_logger.error(f"Error getting models from API {api_base}: {e}")
         return []
 
 
+def _parse_openai_models(data: Dict[str, Any]) -> List[str]:
+    return [model["id"] for model in data.get("data", []) if "id" in model]
+
+
+def _parse_ollama_models(data: Dict[str, Any]) -> List[str]:
+    return [model["name"] for model in data.get("models", [])]
+
+
+async def _fetch_model_listing(
+    api_base: str,
+    api_key: str,
+    is_openai: bool,
+    stale: Optional[ModelListing]
+) -> Optional[ModelListing]:
+    """Fetch a model listing, revalidating the expired one when possible (None on failure)"""
+    # Set headers
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    
+    if is_openai:
+        # OpenAI models
+        candidates = [(f"{api_base}/models", _parse_openai_models, "OpenAI")]
+    else:
+        # For other APIs, try OpenAI-compatible endpoint first
+        # Handle the case where api_base already ends with /v1
+        if api_base.endswith('/v1'):
+            models_url = f"{api_base}/models"
+        else:
+            models_url = f"{api_base}/v1/models"
+        
+        # If OpenAI endpoint fails, try Ollama API
+        if "/v1" in api_base:
+            ollama_base = api_base.replace("/v1", "")
+        else:
+            ollama_base = api_base
+        
+        candidates = [
+            (models_url, _parse_openai_models, "OpenAI"),
+            (f"{ollama_base}/api/tags", _parse_ollama_models, "Ollama")
+        ]
+    
+    for url, parse, label in candidates:
+        request_headers = headers
+        # Revalidate the expired listing instead of downloading it again
+        if stale is not None and stale[1] == url and stale[2]:
+            request_headers = {**headers, "If-None-Match": stale[2]}
+        
+        # Bounded read, so a misbehaving endpoint cannot make the worker buffer an unbounded body
+        status_code, response_headers, body = await get_bytes(url, headers=request_headers)
+        
+        if status_code == 304 and request_headers is not headers:
+            return stale
+        if status_code == 200:
+            return tuple(parse(orjson.loads(body))), url, response_headers.get("ETag")
+        
+        # Log detailed error information for debugging
+        default_logger.warning(f"{label} API endpoint returned status {status_code} for {url}")
+        if status_code != 401:
+            default_logger.warning(f"Response content: {body[:500].decode(errors='replace')}")
+    
+    return None
+
+
 @router.get("/config", response_model=LLMConfigResponse)
 async def get_llm_config():
     """Get current LLM configuration"""
@@ -184,32 +237,24 @@ async def get_llm_config():
 @router.post("/config", response_model=ConfigStatus)
 async def update_llm_config(config: LLMConfig):
     """Update LLM configuration"""
-    # Update configuration using config manager
-    result = config_manager.set_value("llm", "provider", config.provider)
+    # Update configuration using config manager (one save for all fields)
+    result = config_manager.set_values("llm", config.model_dump())
     if not result.success:
         return ConfigStatus(
             status="error",
             message=result.message
         )
     
-    config_manager.set_value("llm", "api_base", config.api_base)
-    config_manager.set_value("llm", "api_key", config.api_key)
-    config_manager.set_value("llm", "model_name", config.model_name)
-    config_manager.set_value("llm", "temperature", config.temperature)
-    config_manager.set_value("llm", "max_tokens", config.max_tokens)
-    config_manager.set_value("llm", "top_p", config.top_p)
-    config_manager.set_value("llm", "frequency_penalty", config.frequency_penalty)
-    config_manager.set_value("llm", "presence_penalty", config.presence_penalty)
-    
     # Update environment variables
-    os.environ["OPENAI_API_BASE"] = config.api_base
-    os.environ["OPENAI_API_KEY"] = config.api_key
-    os.environ["OPENAI_MODEL_NAME"] = config.model_name
-    os.environ["LLM_PROVIDER"] = config.provider
+    os.environ.update({
+        "OPENAI_API_BASE": config.api_base,
+        "OPENAI_API_KEY": config.api_key,
+        "OPENAI_MODEL_NAME": config.model_name,
+        "LLM_PROVIDER": config.provider
+    })
     
     # Reinitialize chat service LLM with new configuration
     try:
-        from api.services.chat_service import chat_service
         if chat_service._initialized:
             await chat_service.reinitialize_llm()
             default_logger.info(f"Chat service LLM reinitialized with provider: {config.provider}")
@@ -229,23 +274,24 @@ async def update_llm_config(config: LLMConfig):
 async def test_llm_config(config: LLMConfig):
     """Test LLM configuration"""
     try:
-        # Import here to avoid circular imports
-        from langchain_openai import ChatOpenAI
-        
         # Create a test LLM instance
         test_llm = ChatOpenAI(
             base_url=config.api_base,
             api_key=config.api_key,
             model=config.model_name,
             temperature=config.temperature,
-            max_tokens=config.max_tokens,
+            # One token is enough to verify the endpoint, key and model
+            max_tokens=LLM_TEST_MAX_TOKENS,
             top_p=config.top_p,
             frequency_penalty=config.frequency_penalty,
             presence_penalty=config.presence_penalty
         )
         
         # Test with a simple prompt
-        test_response = test_llm.invoke("Hello, this is a test.")
+        test_response = await asyncio.wait_for(
+            test_llm.ainvoke("Hello, this is a test."),
+            timeout=LLM_TEST_TIMEOUT
+        )
         
         if test_response:
             return ConfigStatus(
@@ -257,6 +303,11 @@ async def test_llm_config(config: LLMConfig):
                 status="error",
                 message="LLM did not return a response"
             )
+    except asyncio.TimeoutError:
+        return ConfigStatus(
+            status="error",
+            message=f"LLM configuration test timed out after {LLM_TEST_TIMEOUT:.0f} seconds"
+        )
     except Exception as e:
         return ConfigStatus(
             status="error",
@@ -329,11 +380,8 @@ async def reset_llm_config():
 async def import_llm_config(file: UploadFile = File(...)):
     """Import LLM configuration from a file"""
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Parse JSON
-        config_data = json.loads(content.decode("utf-8"))
+        # Read and parse the file (orjson parses the UTF-8 bytes directly)
+        config_data = orjson.loads(await file.read())
         
         # Validate and update configuration
         config = LLMConfig(**config_data)
@@ -371,7 +419,6 @@ async def export_llm_config():
 async def reinitialize_chat_service():
     """Force reinitialize chat service with current LLM configuration"""
     try:
-        from api.services.chat_service import chat_service
         success = await chat_service.reinitialize_llm()
         
         if success:
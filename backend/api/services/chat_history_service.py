@@ -7,17 +7,20 @@ from MySQL database with async operations.
 
 import json
 import uuid
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError, NoResultFound
-from sqlalchemy import select, delete, func, and_, or_
+from sqlalchemy import select, delete, func, or_
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from api.models.database import ChatSession, ChatMessage, ChatMetadata, create_chat_session_async, add_chat_message_async, get_chat_session_async, get_chat_messages_async, get_chat_metadata_async, delete_chat_session_async
+from api.models.database import ChatSession, ChatMessage, chat_session_has_tag, create_chat_session_async, add_chat_message_async, add_chat_messages_async, get_chat_session_async, get_chat_session_cached_async, invalidate_chat_session_cache, get_chat_messages_raw_async, get_chat_session_with_messages_async, iter_chat_messages_async, delete_chat_session_async
 from api.core.database import database_manager
 from api.core.utils import handle_exceptions, default_logger
 
+# Sessions removed per DELETE statement by the bulk delete / cleanup paths
+DELETE_BATCH_SIZE = 1000
+
 
 class ChatHistoryService:
     """
@@ -69,7 +72,7 @@ class ChatHistoryService:
             
             async with database_manager.get_session() as db_session:
                 # Check if session already exists
-                existing_session = await get_chat_session_async(db_session, session_id)
+                existing_session = await get_chat_session_cached_async(db_session, session_id)
                 if existing_session:
                     return existing_session.to_dict()
                 
@@ -109,7 +112,7 @@ class ChatHistoryService:
         try:
             async with database_manager.get_session() as db_session:
                 # Check if session exists, create if not
-                session = await get_chat_session_async(db_session, session_id)
+                session = await get_chat_session_cached_async(db_session, session_id)
                 if not session:
                     session = await create_chat_session_async(db_session, session_id)
                 
@@ -133,6 +136,33 @@ class ChatHistoryService:
             self.logger.error(f"Error adding message to session {session_id}: {str(e)}")
             raise
     
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        reraise=True
+    )
+    async def add_messages(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """Add several messages in one batch (single INSERT and commit)"""
+        if not messages:
+            return []
+        
+        try:
+            async with database_manager.get_session() as db_session:
+                # Check if sessions exist, create if not
+                for session_id in {message["session_id"] for message in messages}:
+                    session = await get_chat_session_cached_async(db_session, session_id)
+                    if not session:
+                        await create_chat_session_async(db_session, session_id)
+                
+                message_ids = await add_chat_messages_async(db_session, messages)
+                
+                self.logger.info(f"Added {len(message_ids)} messages in batch")
+                return message_ids
+                
+        except Exception as e:
+            self.logger.error(f"Error adding message batch: {str(e)}")
+            raise
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
@@ -147,23 +177,25 @@ class ChatHistoryService:
         """Get chat history for a session"""
         try:
             async with database_manager.get_session() as db_session:
-                # Get session info
-                session = await get_chat_session_async(db_session, session_id)
-                if not session:
-                    raise NoResultFound(f"Session {session_id} not found")
-                
-                # Get messages
-                messages = await get_chat_messages_async(db_session, session_id, limit, offset)
-                message_list = [msg.to_dict() for msg in messages]
-                
-                # Get metadata
-                metadata = await get_chat_metadata_async(db_session, session_id)
-                metadata_dict = metadata.to_dict() if metadata else {}
+                if limit is None and offset is None:
+                    # Whole history: session and messages in a single joined query
+                    bundle = await get_chat_session_with_messages_async(db_session, session_id)
+                    if bundle is None:
+                        raise NoResultFound(f"Session {session_id} not found")
+                    session, message_list = bundle
+                else:
+                    # Get session info
+                    session = await get_chat_session_cached_async(db_session, session_id)
+                    if not session:
+                        raise NoResultFound(f"Session {session_id} not found")
+                    
+                    # Get messages
+                    message_list = await get_chat_messages_raw_async(db_session, session_id, limit, offset)
                 
                 return {
                     "session": session.to_dict(),
                     "messages": message_list,
-                    "metadata": metadata_dict
+                    "metadata": session.metadata_to_dict()
                 }
                 
         except NoResultFound:
@@ -172,6 +204,23 @@ class ChatHistoryService:
             self.logger.error(f"Error getting session history for {session_id}: {str(e)}")
             raise
     
+    async def iter_session_messages(self, session_id: str) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream all messages of a session as dicts without loading them all at once"""
+        try:
+            async with database_manager.get_session() as db_session:
+                session = await get_chat_session_cached_async(db_session, session_id)
+                if not session:
+                    raise NoResultFound(f"Session {session_id} not found")
+                
+                async for message in iter_chat_messages_async(db_session, session_id):
+                    yield message.to_dict()
+                    
+        except NoResultFound:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error streaming messages for {session_id}: {str(e)}")
+            raise
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
@@ -258,6 +307,7 @@ class ChatHistoryService:
                 
                 session.updated_at = datetime.utcnow()
                 await db_session.commit()
+                invalidate_chat_session_cache(session_id)
                 await db_session.refresh(session)
                 
                 self.logger.info(f"Updated session {session_id}")
@@ -294,41 +344,67 @@ class ChatHistoryService:
         wait=wait_exponential(multiplier=1, min=1, max=10),
         reraise=True
     )
-    async def delete_all_sessions(self) -> Dict[str, Any]:
+    async def delete_all_sessions(self, batch_size: int = DELETE_BATCH_SIZE) -> Dict[str, Any]:
         """Delete all chat sessions"""
         try:
-            async with database_manager.get_session() as db_session:
-                # Get total count before deletion
-                count_query = select(func.count(ChatSession.id))
-                count_result = await db_session.execute(count_query)
-                total_count = count_result.scalar()
-                
-                # Delete all chat messages first
-                delete_messages_query = delete(ChatMessage)
-                await db_session.execute(delete_messages_query)
-                
-                # Delete all chat sessions
-                delete_sessions_query = delete(ChatSession)
-                await db_session.execute(delete_sessions_query)
-                
-                await db_session.commit()
-                
-                self.logger.info(f"Deleted all {total_count} chat sessions")
-                return {
-                    "deleted_sessions": total_count,
-                    "message": f"Successfully deleted {total_count} chat sessions"
-                }
+            # Messages go with their sessions through ON DELETE CASCADE
+            deleted_session_ids, batches = await self._delete_sessions_in_batches(batch_size)
+            total_count = len(deleted_session_ids)
+            invalidate_chat_session_cache()
+            
+            self.logger.info(f"Deleted all {total_count} chat sessions in {batches} batches")
+            return {
+                "deleted_sessions": total_count,
+                "batches": batches,
+                "message": f"Successfully deleted {total_count} chat sessions"
+            }
                 
         except Exception as e:
             self.logger.error(f"Error deleting all sessions: {str(e)}")
             raise
     
+    async def _delete_sessions_in_batches(self, batch_size: int, *criteria) -> Tuple[List[str], int]:
+        """Delete sessions matching criteria in bounded batches, committing each batch
+        
+        Each batch is one id lookup plus one ``DELETE ... WHERE id IN (...)``,
+        so row locks and the undo log stay bounded no matter how many sessions match.
+        
+        Returns:
+            (session_ids of the deleted sessions, number of batches)
+        """
+        deleted_session_ids: List[str] = []
+        batches = 0
+        ids_query = (
+            select(ChatSession.id, ChatSession.session_id)
+            .where(*criteria)
+            .order_by(ChatSession.id)
+            .limit(batch_size)
+        )
+        
+        while True:
+            async with database_manager.get_session() as db_session:
+                result = await db_session.execute(ids_query)
+                rows = result.all()
+                if not rows:
+                    break
+                
+                await db_session.execute(delete(ChatSession).where(ChatSession.id.in_([row.id for row in rows])))
+                await db_session.commit()
+            
+            deleted_session_ids.extend(row.session_id for row in rows)
+            batches += 1
+            if len(rows) < batch_size:
+                break
+        
+        return deleted_session_ids, batches
+    
     async def search_sessions(
         self,
         query: str,
         user_id: Optional[str] = None,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
+        offset: Optional[int] = None,
+        tag: Optional[str] = None
     ) -> Dict[str, Any]:
         """Search chat sessions by content"""
         try:
@@ -343,6 +419,8 @@ class ChatHistoryService:
                 
                 if user_id:
                     search_query = search_query.where(ChatSession.user_id == user_id)
+                if tag:
+                    search_query = search_query.where(chat_session_has_tag(tag))
                 
                 # Group by session to avoid duplicates
                 search_query = search_query.group_by(ChatSession.id)
@@ -370,38 +448,29 @@ class ChatHistoryService:
             raise
     
       
-    async def cleanup_old_sessions(self, days_old: int = 30) -> Dict[str, Any]:
+    async def cleanup_old_sessions(self, days_old: int = 30, batch_size: int = DELETE_BATCH_SIZE) -> Dict[str, Any]:
         """Clean up old inactive sessions"""
         try:
-            async with database_manager.get_session() as db_session:
-                # Calculate cutoff date
-                cutoff_date = datetime.utcnow() - timedelta(days=days_old)
-                
-                # Find old inactive sessions
-                old_sessions_query = select(ChatSession).where(
-                    and_(
-                        ChatSession.is_active == False,
-                        ChatSession.updated_at < cutoff_date
-                    )
-                )
-                
-                result = await db_session.execute(old_sessions_query)
-                old_sessions = result.scalars().all()
-                
-                # Delete old sessions
-                deleted_count = 0
-                for session in old_sessions:
-                    await db_session.delete(session)
-                    deleted_count += 1
-                
-                await db_session.commit()
-                
-                self.logger.info(f"Cleaned up {deleted_count} old sessions")
-                return {
-                    "deleted_sessions": deleted_count,
-                    "cutoff_date": cutoff_date.isoformat(),
-                    "days_old": days_old
-                }
+            # Calculate cutoff date
+            cutoff_date = datetime.utcnow() - timedelta(days=days_old)
+            
+            # Delete old inactive sessions (messages cascade)
+            deleted_session_ids, batches = await self._delete_sessions_in_batches(
+                batch_size,
+                ChatSession.is_active == False,
+                ChatSession.updated_at < cutoff_date
+            )
+            deleted_count = len(deleted_session_ids)
+            invalidate_chat_session_cache()
+            
+            self.logger.info(f"Cleaned up {deleted_count} old sessions in {batches} batches")
+            return {
+                "deleted_sessions": deleted_count,
+                "deleted_session_ids": deleted_session_ids,
+                "batches": batches,
+                "cutoff_date": cutoff_date.isoformat(),
+                "days_old": days_old
+            }
                 
         except Exception as e:
             self.logger.error(f"Error cleaning up old sessions: {str(e)}")
@@ -8,7 +8,9 @@ and integration with LLM and knowledge base.
 import os
 import uuid
 import json
-from typing import List, Dict, Any, Optional, AsyncGenerator
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
 from datetime import datetime
 
 from langchain_openai import ChatOpenAI
@@ -25,6 +27,10 @@ from api.core.utils import handle_exceptions, default_logger
 from api.services.base_service import BaseService
 from api.services.chat_history_service import chat_history_service
 
+# First-turn answers are reused for identical questions for this many seconds
+ANSWER_CACHE_TTL = 600.0
+ANSWER_CACHE_MAX_ENTRIES = 256
+
 
 class StreamingCallbackHandler(BaseCallbackHandler):
     """Callback handler for streaming LLM responses"""
@@ -71,6 +77,8 @@ class ChatService(BaseService):
         self.qa_chain = None
         self.chat_history = {}  # session_id -> history
         self._history_cache = {}  # session_id -> formatted_history cache
+        # (normalized question, system prompt, knowledge generation) -> (expires_at, response, source_documents)
+        self._answer_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, str, List[Dict[str, Any]]]]" = OrderedDict()
     
     async def initialize(self) -> bool:
         """Initialize chat service"""
@@ -264,8 +272,35 @@ class ChatService(BaseService):
         if session_id in self._history_cache:
             del self._history_cache[session_id]
     
+    def _answer_cache_key(self, message: str, system_prompt: Optional[str]) -> Tuple[str, str, int]:
+        """回答キャッシュのキーを作成（空白と大文字小文字の違いを無視）
+        
+        ナレッジベースの世代を含めるため、ドキュメントの追加・削除後は古い回答が使われない
+        """
+        return " ".join(message.split()).casefold(), system_prompt or "", qdrant_manager.generation
+    
+    def _get_cached_answer(self, key: Tuple[str, str, int]) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """キャッシュ済みの回答を取得"""
+        entry = self._answer_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._answer_cache[key]
+            return None
+        self._answer_cache.move_to_end(key)
+        return entry[1], entry[2]
+    
+    def _store_cached_answer(self, key: Tuple[str, str, int], response: str, source_documents: List[Dict[str, Any]]) -> None:
+        """回答をキャッシュに保存（古いものから削除）"""
+        self._answer_cache[key] = (time.monotonic() + ANSWER_CACHE_TTL, response, source_documents)
+        self._answer_cache.move_to_end(key)
+        while len(self._answer_cache) > ANSWER_CACHE_MAX_ENTRIES:
+            self._answer_cache.popitem(last=False)
+    
     async def _setup_qa_chain(self):
         """Setup RetrievalQA chain"""
+        # A new chain (LLM or prompt change) invalidates cached answers
+        self._answer_cache.clear()
         try:
             if not qdrant_manager._initialized or not qdrant_manager.vectorstore:
                 self.log_warning("Vector store not initialized")
@@ -338,39 +373,53 @@ class ChatService(BaseService):
                             if messages[i]["role"] == "user" and messages[i + 1]["role"] == "assistant":
                                 chat_history_pairs.append((messages[i]["content"], messages[i + 1]["content"]))
                 
-                # システムプロンプトが指定されている場合は一時的なQAチェーンを作成
-                if system_prompt:
-                    temp_qa_chain = self._create_qa_chain(self.llm, include_prompt=True, system_prompt=system_prompt)
-                    result = temp_qa_chain.invoke({
-                        "question": message,
-                        "chat_history": chat_history_pairs
-                    })
+                # 履歴のない最初の質問は回答が質問とシステムプロンプトだけで決まるのでキャッシュを使う
+                answer_cache_key = None
+                cached_answer = None
+                if not chat_history_pairs:
+                    answer_cache_key = self._answer_cache_key(message, system_prompt)
+                    cached_answer = self._get_cached_answer(answer_cache_key)
+                
+                if cached_answer is not None:
+                    response, source_documents = cached_answer
+                    self.log_debug("Answer served from cache")
                 else:
-                    result = self.qa_chain.invoke({
-                        "question": message,
-                        "chat_history": chat_history_pairs
-                    })
+                    # システムプロンプトが指定されている場合は一時的なQAチェーンを作成
+                    if system_prompt:
+                        temp_qa_chain = self._create_qa_chain(self.llm, include_prompt=True, system_prompt=system_prompt)
+                        result = temp_qa_chain.invoke({
+                            "question": message,
+                            "chat_history": chat_history_pairs
+                        })
+                    else:
+                        result = self.qa_chain.invoke({
+                            "question": message,
+                            "chat_history": chat_history_pairs
+                        })
                 
-                # Extract response and source documents
-                self.log_debug(f"QA chain result type: {type(result)}")
-                self.log_debug(f"QA chain result: {result}")
+                    # Extract response and source documents
+                    self.log_debug(f"QA chain result type: {type(result)}")
+                    self.log_debug(f"QA chain result: {result}")
                 
-                # ConversationalRetrievalChain returns response in 'result' key
-                if isinstance(result, dict):
-                    response = result.get("answer", str(result))
-                    source_documents = []
+                    # ConversationalRetrievalChain returns response in 'result' key
+                    if isinstance(result, dict):
+                        response = result.get("answer", str(result))
+                        source_documents = []
                     
-                    # Extract source documents if available
-                    if "source_documents" in result:
-                        for doc in result["source_documents"]:
-                            source_documents.append({
-                                "content": doc.page_content,
-                                "metadata": doc.metadata
-                            })
-                else:
-                    # Handle unexpected response format
-                    response = str(result)
-                    source_documents = []
+                        # Extract source documents if available
+                        if "source_documents" in result:
+                            for doc in result["source_documents"]:
+                                source_documents.append({
+                                    "content": doc.page_content,
+                                    "metadata": doc.metadata
+                                })
+                    else:
+                        # Handle unexpected response format
+                        response = str(result)
+                        source_documents = []
+                    
+                    if answer_cache_key is not None and isinstance(result, dict):
+                        self._store_cached_answer(answer_cache_key, response, source_documents)
             else:
                 # Fallback to simple knowledge search
                 search_results = await qdrant_manager.search_similar_documents(message, k=3)
@@ -681,8 +730,7 @@ class ChatService(BaseService):
         """Get chat history for a session"""
         # First try to get from in-memory cache
         if session_id in self.chat_history:
-            self.log_info(f"Retrieved chat history for session {session_id} from memory",
-                          history_length=len(self.chat_history[session_id]))
+            self.log_debug(f"Retrieved chat history for session {session_id} from memory")
             return self.chat_history[session_id]
         
         # Try to get from database
@@ -715,6 +763,15 @@ class ChatService(BaseService):
         self.log_warning(f"No chat history found for session {session_id}")
         return []
     
+    def evict_chat_history(self, session_id: Optional[str] = None) -> None:
+        """Drop the in-memory history of one session (or of all sessions when session_id is None)"""
+        if session_id is None:
+            self.chat_history.clear()
+            self._history_cache.clear()
+        else:
+            self.chat_history.pop(session_id, None)
+            self._history_cache.pop(session_id, None)
+    
     async def clear_chat_history(self, session_id: str) -> bool:
         """Clear chat history for a session"""
         cleared_memory = False
@@ -10,6 +10,7 @@ import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 
@@ -20,6 +21,8 @@ load_dotenv()
 from api.routes import chat, llm_config, knowledge, config, embedding_config
 from api.core.config_manager import settings
 from api.core.config_watcher import config_updater
+from api.core.http_client import close_http_client
+from api.core.qdrant_manager import qdrant_manager
 from api.core.database import initialize_database_on_startup, cleanup_database_on_shutdown, database_manager, check_database_health
 from api.services.chat_service import chat_service
 from api.services.base_service import ServiceRegistry
@@ -43,6 +46,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         pass
     
+    # Initialize the vector store once, before requests reach the knowledge routes
+    await qdrant_manager.initialize()
+    
     # Register and initialize services
     ServiceRegistry.register("chat_service", chat_service)
     initialization_results = await ServiceRegistry.initialize_all()
@@ -58,6 +64,8 @@ async def lifespan(app: FastAPI):
         await cleanup_database_on_shutdown()
     except Exception as e:
         pass
+    # Close the shared outbound HTTP client
+    await close_http_client()
     # Stop config watcher
     config_updater.stop()
 
@@ -66,7 +74,8 @@ app = FastAPI(
     title="Chatbot System API",
     description="API for a chatbot system with LLM configuration and knowledge management",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -0,0 +1,18 @@
+"""Tests for session cleanup in the chat routes"""
+
+from api.routes import chat
+
+
+async def test_cleanup_evicts_in_memory_history_of_deleted_sessions(monkeypatch):
+    async def cleanup_old_sessions(days_old):
+        return {"deleted_sessions": 1, "deleted_session_ids": ["old"], "batches": 1}
+
+    monkeypatch.setattr(chat.chat_history_service, "cleanup_old_sessions", cleanup_old_sessions)
+    monkeypatch.setattr(chat.chat_service, "chat_history", {"old": ["stale"], "kept": ["live"]})
+    monkeypatch.setattr(chat.chat_service, "_history_cache", {"old": "stale", "kept": "live"})
+
+    response = await chat.cleanup_old_sessions(days_old=30)
+
+    assert chat.chat_service.chat_history == {"kept": ["live"]}
+    assert chat.chat_service._history_cache == {"kept": "live"}
+    assert "deleted_session_ids" not in response["data"]
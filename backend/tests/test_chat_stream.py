@@ -0,0 +1,127 @@
+"""Tests for the streaming chat routes"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import NoResultFound
+
+from api.routes import chat
+from api.routes.chat import _coalesce_tokens
+
+
+def _token(index: int, text: str):
+    return {"type": "token", "token": text, "index": index}
+
+
+async def _source(chunks, pause_after=None, pause=0.0):
+    for position, chunk in enumerate(chunks):
+        yield chunk
+        if position == pause_after:
+            await asyncio.sleep(pause)
+
+
+async def _collect(chunks, **kwargs):
+    return [chunk async for chunk in _coalesce_tokens(chunks, **kwargs)]
+
+
+async def test_tokens_are_merged_up_to_max_chunks():
+    tokens = [_token(i, str(i)) for i in range(5)]
+
+    merged = await _collect(_source(tokens), max_chunks=2, max_seconds=60.0)
+
+    assert merged == [_token(0, "01"), _token(2, "23"), _token(4, "4")]
+
+
+async def test_non_token_chunk_flushes_the_batch_and_passes_through():
+    chunks = [_token(0, "a"), _token(1, "b"), {"type": "sources", "documents": []}, _token(2, "c")]
+
+    merged = await _collect(_source(chunks), max_chunks=16, max_seconds=60.0)
+
+    assert merged == [_token(0, "ab"), {"type": "sources", "documents": []}, _token(2, "c")]
+
+
+async def test_batch_is_flushed_on_time_while_the_source_stalls():
+    chunks = [_token(0, "a"), _token(1, "b")]
+    stream = _coalesce_tokens(_source(chunks, pause_after=0, pause=1.0), max_chunks=16, max_seconds=0.05)
+
+    # The first token arrives before the stall and must not wait for the second one
+    first = await asyncio.wait_for(stream.__anext__(), timeout=0.5)
+    await stream.aclose()
+
+    assert first == _token(0, "a")
+
+
+async def test_source_error_is_raised_after_pending_tokens():
+    async def failing():
+        yield _token(0, "a")
+        raise RuntimeError("stream failed")
+
+    stream = _coalesce_tokens(failing(), max_chunks=16, max_seconds=60.0)
+
+    assert await stream.__anext__() == _token(0, "a")
+    with pytest.raises(RuntimeError, match="stream failed"):
+        await stream.__anext__()
+
+
+async def test_closing_the_stream_closes_the_source():
+    closed = asyncio.Event()
+
+    async def endless():
+        try:
+            index = 0
+            while True:
+                yield _token(index, "t")
+                index += 1
+                await asyncio.sleep(0)
+        finally:
+            closed.set()
+
+    stream = _coalesce_tokens(endless(), max_chunks=4, max_seconds=60.0)
+    assert await stream.__anext__() == _token(0, "tttt")
+    await stream.aclose()
+
+    await asyncio.wait_for(closed.wait(), timeout=1.0)
+
+
+async def _body(response) -> bytes:
+    return b"".join([part async for part in response.body_iterator])
+
+
+async def test_ndjson_stream_of_a_missing_session_is_404(monkeypatch):
+    async def missing(session_id):
+        raise NoResultFound(f"Session {session_id} not found")
+        yield
+
+    monkeypatch.setattr(chat.chat_history_service, "iter_session_messages", missing)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await chat._stream_session_messages_ndjson("nope")
+    assert excinfo.value.status_code == 404
+
+
+async def test_ndjson_stream_of_an_empty_session_is_empty(monkeypatch):
+    async def empty(session_id):
+        return
+        yield
+
+    monkeypatch.setattr(chat.chat_history_service, "iter_session_messages", empty)
+
+    response = await chat._stream_session_messages_ndjson("empty")
+
+    assert response.status_code == 200
+    assert await _body(response) == b""
+
+
+async def test_ndjson_stream_writes_one_message_per_line(monkeypatch):
+    async def messages(session_id):
+        yield {"role": "user", "content": "hi"}
+        yield {"role": "assistant", "content": "hello"}
+
+    monkeypatch.setattr(chat.chat_history_service, "iter_session_messages", messages)
+
+    response = await chat._stream_session_messages_ndjson("s1")
+
+    assert await _body(response) == (
+        b'{"role":"user","content":"hi"}\n{"role":"assistant","content":"hello"}\n'
+    )
@@ -0,0 +1,37 @@
+"""Tests for the time-ordered message ID generator"""
+
+import time
+import uuid
+
+from api.models.database import uuid7_str
+
+
+def test_uuid7_has_version_and_variant():
+    value = uuid.UUID(uuid7_str())
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_leads_with_the_current_unix_milliseconds():
+    before = time.time_ns() // 1_000_000
+    value = uuid.UUID(uuid7_str())
+    after = time.time_ns() // 1_000_000
+
+    assert before <= value.int >> 80 <= after
+
+
+def test_uuid7_fits_the_identifier_column():
+    value = uuid7_str()
+
+    assert len(value) == 36
+    assert value.isascii()
+
+
+def test_uuid7_is_unique_and_time_ordered_across_milliseconds():
+    first = uuid7_str()
+    time.sleep(0.002)
+    second = uuid7_str()
+
+    assert first < second
+    assert len({uuid7_str() for _ in range(1000)}) == 1000
@@ -0,0 +1,92 @@
+"""Tests for streaming upload chunking in the knowledge routes"""
+
+import pytest
+
+from api.routes import knowledge
+
+
+class FakeUpload:
+    """Minimal stand-in for UploadFile that serves fixed-size reads"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._offset = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = len(self._data) - self._offset
+        block = self._data[self._offset:self._offset + size]
+        self._offset += len(block)
+        return block
+
+
+async def _collect_chunks(data: bytes):
+    return [chunk async for chunk in knowledge._iter_upload_chunks(FakeUpload(data))]
+
+
+@pytest.fixture
+def small_windows(monkeypatch):
+    # Small reads and split windows so a short text crosses many block boundaries
+    monkeypatch.setattr(knowledge, "UPLOAD_READ_SIZE", 8)
+    monkeypatch.setattr(knowledge, "UPLOAD_CHUNK_SIZE", 40)
+    monkeypatch.setattr(knowledge, "UPLOAD_CHUNK_OVERLAP", 10)
+    monkeypatch.setattr(knowledge, "UPLOAD_SPLIT_WINDOW", 80)
+
+
+async def test_block_boundaries_on_whitespace_keep_words_apart(small_windows):
+    # Every word is 7 characters + one separator, so each 8-byte read ends on whitespace
+    words = [f"word{i:03d}" for i in range(200)]
+    text = "\n".join(" ".join(words[i:i + 5]) for i in range(0, len(words), 5))
+
+    chunks = await _collect_chunks(text.encode("utf-8"))
+
+    chunk_words = {word for chunk in chunks for word in chunk.split()}
+    assert chunk_words == set(words)
+    assert all(len(chunk) <= 40 for chunk in chunks)
+
+
+async def test_every_chunk_is_a_slice_of_the_original_text(small_windows):
+    text = " ".join(f"token{i}" for i in range(300))
+
+    chunks = await _collect_chunks(text.encode("utf-8"))
+
+    assert all(chunk in text for chunk in chunks)
+    assert chunks[0].startswith("token0 ")
+    assert chunks[-1].endswith("token299")
+
+
+async def test_multibyte_characters_split_across_reads(small_windows):
+    text = "日本語のテキスト " * 50
+
+    chunks = await _collect_chunks(text.encode("utf-8"))
+
+    assert {word for chunk in chunks for word in chunk.split()} == {"日本語のテキスト"}
+
+
+async def test_invalid_utf8_raises(small_windows):
+    with pytest.raises(UnicodeDecodeError):
+        await _collect_chunks(b"valid text " * 20 + b"\xff\xfe")
+
+
+async def test_failed_upload_deletes_points_already_written(small_windows, monkeypatch):
+    monkeypatch.setattr(knowledge, "INGEST_BATCH_SIZE", 4)
+    added_ids, deleted_ids = [], []
+    calls = iter([True, True, False])
+
+    async def add_documents_batch(documents, ids=None):
+        added_ids.extend(ids)
+        return next(calls)
+
+    async def delete_documents_by_ids(doc_ids):
+        deleted_ids.extend(doc_ids)
+        return True
+
+    monkeypatch.setattr(knowledge.qdrant_manager, "add_documents_batch", add_documents_batch)
+    monkeypatch.setattr(knowledge.qdrant_manager, "delete_documents_by_ids", delete_documents_by_ids)
+
+    text = " ".join(f"token{i}" for i in range(300))
+    success = await knowledge._ingest_upload(FakeUpload(text.encode("utf-8")), {"source": "test"})
+
+    assert success is False
+    assert len(added_ids) == 12
+    assert deleted_ids == added_ids
@@ -0,0 +1,47 @@
+"""Tests for the LLM model listing"""
+
+import functools
+
+import httpx
+import pytest
+
+from api.core import http_client
+from api.routes import llm_config
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Serve the shared HTTP client from a handler set by the test"""
+    requests = []
+    handlers = {}
+
+    def transport(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handlers["respond"](request)
+
+    monkeypatch.setattr(http_client, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(transport)))
+    monkeypatch.setattr(llm_config, "_models_cache", llm_config.TTLCache(0.0, 4))
+    return requests, handlers
+
+
+async def test_expired_listing_is_revalidated_with_its_etag(upstream):
+    requests, handlers = upstream
+
+    def respond(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": [{"id": "model-a"}]}, headers={"ETag": '"v1"'})
+
+    handlers["respond"] = respond
+
+    assert await llm_config.get_models_from_api("http://llm.local/v1") == ["model-a"]
+    assert await llm_config.get_models_from_api("http://llm.local/v1") == ["model-a"]
+    assert [request.headers.get("If-None-Match") for request in requests] == [None, '"v1"']
+
+
+async def test_oversized_listing_is_not_buffered(upstream, monkeypatch):
+    _, handlers = upstream
+    monkeypatch.setattr(llm_config, "get_bytes", functools.partial(http_client.get_bytes, max_bytes=16))
+    handlers["respond"] = lambda request: httpx.Response(200, json={"data": [{"id": "x" * 64}]})
+
+    assert await llm_config.get_models_from_api("http://llm.local/v1") == []
@@ -0,0 +1,109 @@
+"""Tests for the semantic search cache"""
+
+import math
+
+from api.core.semantic_cache import SemanticCache
+
+
+def _vector(*components: float):
+    return SemanticCache.normalize(components)
+
+
+def _results(name: str, count: int = 4):
+    return [{"content": f"{name}-{i}"} for i in range(count)]
+
+
+def test_lookup_hits_for_the_same_query():
+    cache = SemanticCache(max_size=8)
+    query = _vector(1.0, 0.0, 0.0)
+    cache.store(query, 4, _results("a"), cache.generation)
+
+    assert cache.lookup(query, 4) == _results("a")
+
+
+def test_lookup_misses_for_an_unrelated_query():
+    cache = SemanticCache(max_size=8)
+    cache.store(_vector(1.0, 0.0, 0.0), 4, _results("a"), cache.generation)
+
+    assert cache.lookup(_vector(0.0, 1.0, 0.0), 4) is None
+
+
+def test_same_cluster_does_not_return_another_querys_results():
+    # B is close enough to join A's cluster but below the hit threshold for A
+    cache = SemanticCache(max_size=8, threshold=0.92, cluster_threshold=0.86)
+    a = _vector(1.0, 0.0, 0.0)
+    b = _vector(0.87, math.sqrt(1 - 0.87 ** 2), 0.0)
+    cache.store(a, 4, _results("a"), cache.generation)
+
+    assert cache.lookup(b, 4) is None
+
+    cache.store(b, 4, _results("b"), cache.generation)
+    assert len(cache) == 1
+    assert cache.lookup(a, 4) == _results("a")
+    assert cache.lookup(b, 4) == _results("b")
+
+
+def test_lookup_needs_results_for_at_least_k():
+    cache = SemanticCache(max_size=8)
+    query = _vector(1.0, 0.0, 0.0)
+    cache.store(query, 3, _results("a", 3), cache.generation)
+
+    assert cache.lookup(query, 5) is None
+    assert cache.lookup(query, 2) == _results("a", 2)
+
+
+def test_store_from_an_older_generation_is_dropped():
+    cache = SemanticCache(max_size=8)
+    query = _vector(1.0, 0.0, 0.0)
+    generation = cache.generation
+    cache.invalidate()
+
+    cache.store(query, 4, _results("a"), generation)
+
+    assert len(cache) == 0
+    assert cache.lookup(query, 4) is None
+
+
+def test_invalidate_drops_entries_and_bumps_generation():
+    cache = SemanticCache(max_size=8)
+    query = _vector(1.0, 0.0, 0.0)
+    cache.store(query, 4, _results("a"), cache.generation)
+    generation = cache.generation
+
+    cache.invalidate()
+
+    assert cache.generation == generation + 1
+    assert cache.lookup(query, 4) is None
+    cache.store(query, 4, _results("b"), cache.generation)
+    assert cache.lookup(query, 4) == _results("b")
+
+
+def test_least_recently_used_cluster_is_evicted():
+    cache = SemanticCache(max_size=2)
+    a, b, c = _vector(1.0, 0.0, 0.0), _vector(0.0, 1.0, 0.0), _vector(0.0, 0.0, 1.0)
+    cache.store(a, 4, _results("a"), cache.generation)
+    cache.store(b, 4, _results("b"), cache.generation)
+    assert cache.lookup(a, 4) is not None
+
+    cache.store(c, 4, _results("c"), cache.generation)
+
+    assert len(cache) == 2
+    assert cache.lookup(a, 4) == _results("a")
+    assert cache.lookup(b, 4) is None
+    assert cache.lookup(c, 4) == _results("c")
+
+
+def test_dimension_change_resets_the_cache():
+    cache = SemanticCache(max_size=8)
+    old = _vector(1.0, 0.0, 0.0)
+    cache.store(old, 4, _results("a"), cache.generation)
+
+    new = _vector(1.0, 0.0, 0.0, 0.0)
+    cache.store(new, 4, _results("b"), cache.generation)
+
+    assert cache.lookup(old, 4) is None
+    assert cache.lookup(new, 4) == _results("b")
+
+
+def test_zero_vector_is_not_normalized():
+    assert SemanticCache.normalize([0.0, 0.0]) is None
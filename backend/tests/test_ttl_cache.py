@@ -0,0 +1,104 @@
+"""Tests for the async TTL cache used by the model listing routes"""
+
+import asyncio
+
+from api.core.ttl_cache import TTLCache
+
+
+def _counting_fetch(value="v"):
+    calls = []
+
+    async def fetch(stale):
+        calls.append(stale)
+        return value
+
+    return fetch, calls
+
+
+async def test_fresh_value_is_served_from_the_cache():
+    cache = TTLCache(ttl=60.0, max_entries=4)
+    fetch, calls = _counting_fetch()
+
+    assert await cache.get_or_fetch("k", fetch) == "v"
+    assert await cache.get_or_fetch("k", fetch) == "v"
+    assert calls == [None]
+
+
+async def test_refresh_fetches_again():
+    cache = TTLCache(ttl=60.0, max_entries=4)
+    fetch, calls = _counting_fetch()
+
+    await cache.get_or_fetch("k", fetch)
+    await cache.get_or_fetch("k", fetch, refresh=True)
+
+    assert calls == [None, "v"]
+
+
+async def test_expired_value_is_passed_to_the_fetch():
+    cache = TTLCache(ttl=0.0, max_entries=4)
+    fetch, calls = _counting_fetch()
+
+    await cache.get_or_fetch("k", fetch)
+    await cache.get_or_fetch("k", fetch)
+
+    assert calls == [None, "v"]
+
+
+async def test_none_is_not_cached():
+    cache = TTLCache(ttl=60.0, max_entries=4)
+    fetch, calls = _counting_fetch(None)
+
+    assert await cache.get_or_fetch("k", fetch) is None
+    assert await cache.get_or_fetch("k", fetch) is None
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+async def test_concurrent_misses_share_one_fetch():
+    cache = TTLCache(ttl=60.0, max_entries=4)
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch(stale):
+        calls.append(stale)
+        await release.wait()
+        return "v"
+
+    waiters = [asyncio.ensure_future(cache.get_or_fetch("k", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["v", "v", "v"]
+    assert len(calls) == 1
+
+
+async def test_cancelled_caller_does_not_cancel_the_fetch():
+    cache = TTLCache(ttl=60.0, max_entries=4)
+    release = asyncio.Event()
+
+    async def fetch(stale):
+        await release.wait()
+        return "v"
+
+    first = asyncio.ensure_future(cache.get_or_fetch("k", fetch))
+    second = asyncio.ensure_future(cache.get_or_fetch("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "v"
+
+
+async def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60.0, max_entries=2)
+    fetch, calls = _counting_fetch()
+
+    await cache.get_or_fetch("a", fetch)
+    await cache.get_or_fetch("b", fetch)
+    await cache.get_or_fetch("a", fetch)
+    await cache.get_or_fetch("c", fetch)
+    await cache.get_or_fetch("a", fetch)
+    await cache.get_or_fetch("b", fetch)
+
+    assert len(calls) == 4
+    assert len(cache) == 2